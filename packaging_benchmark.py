@@ -0,0 +1,243 @@
+"""Scaling benchmarks of the packaging station model.
+
+Every case simulates a plant of 1, 10, 100 or 1000 PackagingStationControllers
+(one maintenance operator and one material handler per five stations) in
+serial or pipelined flow over a short (1 h) or long (8 h) horizon, with a
+fixed seed. Each case runs in a fresh interpreter so its peak RSS is its own,
+and is repeated until its runs add up to --min-time seconds. It reports:
+
+    wall_time_per_sim_hour   wall-clock seconds of the median run per simulated hour
+    events_per_second        SimPy events processed per wall-clock second in the
+                             median run (every run of a case processes the same
+                             events; how many per simulated hour depends on the
+                             station count and flow)
+    wall_time_spread         interquartile range of the run times over their median
+    peak_rss_mb              peak resident set size of the case's process
+
+Results are written as JSON and compared against a stored baseline; a case
+that got slower or bigger than the tolerance allows fails the run (exit
+status 1). A case's time tolerance is widened to SPREAD_TOLERANCE_FACTOR
+times the larger of its current and baseline spread, so short, noisy cases
+do not fail on scheduling jitter. The full suite takes about an hour on
+one core, --quick skips the 1000-station cases.
+
+    python packaging_benchmark.py --quick --output results.json
+    python packaging_benchmark.py --update-baseline
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+STATION_COUNTS = (1, 10, 100, 1000)
+FLOW_MODES = ("serial", "pipelined")
+HORIZONS = {'short': 3600.0, 'long': 8 * 3600.0}
+STATIONS_PER_CREW_MEMBER = 5
+BENCHMARK_SEED = 1
+DEFAULT_MIN_TIME = 5.0
+# A case may slow down by this many times its relative run time spread before it counts as a regression
+SPREAD_TOLERANCE_FACTOR = 3.0
+
+# =====================================================
+# ----------- Benchmark Cases -------------------------
+# =====================================================
+
+def case_key(stations, flow_mode, horizon):
+    return f"{stations}-{flow_mode}-{horizon}"
+
+def all_cases(station_counts=STATION_COUNTS, flow_modes=FLOW_MODES, horizons=tuple(HORIZONS)):
+    return [(stations, flow_mode, horizon)
+            for stations in station_counts for flow_mode in flow_modes for horizon in horizons]
+
+def relative_spread(values):
+    """Interquartile range over the median; 0 for fewer than two values"""
+    if len(values) < 2:
+        return 0.0
+    low, _, high = statistics.quantiles(values, n=4, method="inclusive")
+    return (high - low) / statistics.median(values)
+
+def run_case(stations, flow_mode, horizon, min_time=DEFAULT_MIN_TIME):
+    """Simulate one case in this process, repeating it until its runs add up to
+    `min_time` seconds, and return the median repetition's measurements"""
+    import resource
+    import simpy
+    from packaging_sim_model import PackagingPlant
+
+    until = HORIZONS[horizon]
+    crew = -(-stations // STATIONS_PER_CREW_MEMBER)
+    setup_times, wall_times = [], []
+    while not wall_times or sum(wall_times) < min_time:
+        setup_start = time.perf_counter()
+        plant = PackagingPlant(simpy.Environment(), stations, crew, crew, flow_mode, seed=BENCHMARK_SEED)
+        run_start = time.perf_counter()
+        events = 0
+
+        def step(original_step=plant.env.step):
+            nonlocal events
+            events += 1
+            original_step()
+
+        plant.env.step = step
+        plant.env.run(until=until)
+        wall_times.append(time.perf_counter() - run_start)
+        setup_times.append(run_start - setup_start)
+    wall_time = statistics.median(wall_times)
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    peak_rss_mb = peak_rss / 1024 ** 2 if sys.platform == "darwin" else peak_rss / 1024
+    return {
+        'stations': stations,
+        'flow_mode': flow_mode,
+        'horizon': horizon,
+        'sim_time': until,
+        'repetitions': len(wall_times),
+        'setup_time': statistics.median(setup_times),
+        'wall_time': wall_time,
+        'wall_time_spread': relative_spread(wall_times),
+        'wall_time_per_sim_hour': wall_time / (until / 3600),
+        'events': events,
+        'events_per_second': events / wall_time,
+        'peak_rss_mb': peak_rss_mb
+    }
+
+def measure_case(stations, flow_mode, horizon, min_time=DEFAULT_MIN_TIME):
+    """run_case in a fresh interpreter, so earlier cases do not inflate its peak RSS"""
+    output = subprocess.run([sys.executable, os.path.abspath(__file__), "--child",
+                             case_key(stations, flow_mode, horizon), "--min-time", str(min_time)],
+                            check=True, capture_output=True, text=True).stdout
+    return json.loads(output)
+
+# =====================================================
+# ----------- Baseline Comparison ---------------------
+# =====================================================
+
+class BenchmarkComparison:
+    """Current results against a baseline, per case and metric"""
+    def __init__(self, results, baseline, time_tolerance=0.25, memory_tolerance=0.25):
+        self.results = results
+        self.baseline = baseline
+        self.time_tolerance = time_tolerance
+        self.memory_tolerance = memory_tolerance
+        self.regressions = []
+        self.rows = []
+        baseline_cases = baseline.get('cases', {})
+        for key, result in results['cases'].items():
+            reference = baseline_cases.get(key)
+            if reference is None:
+                self.rows.append((key, result, None))
+                continue
+            ratios = {
+                'events_per_second': result['events_per_second'] / reference['events_per_second'],
+                'peak_rss_mb': result['peak_rss_mb'] / reference['peak_rss_mb']
+            }
+            self.rows.append((key, result, ratios))
+            tolerance = self.case_time_tolerance(result, reference)
+            # Slowdown as a fraction of the baseline run time
+            if 1.0 / ratios['events_per_second'] - 1.0 > tolerance:
+                self.regressions.append(f"{key}: events/s down to {ratios['events_per_second']:.0%} of baseline "
+                                        f"(tolerance {tolerance:.0%} slower)")
+            if ratios['peak_rss_mb'] > 1.0 + self.memory_tolerance:
+                self.regressions.append(f"{key}: peak RSS up to {ratios['peak_rss_mb']:.0%} of baseline")
+
+    def case_time_tolerance(self, result, reference):
+        """The time tolerance, widened for cases whose run times spread more than it"""
+        spread = max(result.get('wall_time_spread', 0.0), reference.get('wall_time_spread', 0.0))
+        return max(self.time_tolerance, SPREAD_TOLERANCE_FACTOR * spread)
+
+    @property
+    def passed(self):
+        return not self.regressions
+
+    def format_report(self):
+        lines = [f"   {'case':<22} {'s/sim h':>9} {'events/s':>10} {'spread':>7} {'RSS MB':>8}   vs baseline"]
+        for key, result, ratios in self.rows:
+            versus = ("no baseline" if ratios is None else
+                      f"{ratios['events_per_second']:.2f}x events/s, {ratios['peak_rss_mb']:.2f}x RSS")
+            lines.append(f"   {key:<22} {result['wall_time_per_sim_hour']:>9.3f} {result['events_per_second']:>10.0f} "
+                         f"{result['wall_time_spread']:>7.1%} "
+                         f"{result['peak_rss_mb']:>8.1f}   {versus}")
+        if self.passed:
+            lines.append("✅ No benchmark regressions")
+        else:
+            lines.append(f"❌ {len(self.regressions)} benchmark regressions:")
+            lines.extend(f"   {regression}" for regression in self.regressions)
+        return "\n".join(lines)
+
+def run_suite(cases, min_time=DEFAULT_MIN_TIME, progress=True):
+    """Measure every case and return the results document"""
+    results = {
+        'machine': {'python': platform.python_version(), 'platform': platform.platform(),
+                    'processor': platform.processor(), 'cpu_count': os.cpu_count()},
+        'seed': BENCHMARK_SEED,
+        'cases': {}
+    }
+    for stations, flow_mode, horizon in cases:
+        key = case_key(stations, flow_mode, horizon)
+        results['cases'][key] = measure_case(stations, flow_mode, horizon, min_time)
+        if progress:
+            result = results['cases'][key]
+            print(f"⏱️ {key}: {result['wall_time_per_sim_hour']:.3f} s per sim hour, "
+                  f"{result['events_per_second']:.0f} events/s, "
+                  f"{result['wall_time']:.2f} s median of {result['repetitions']} "
+                  f"(spread {result['wall_time_spread']:.1%}), {result['peak_rss_mb']:.1f} MB", file=sys.stderr)
+    return results
+
+def _parse_case(key):
+    stations, flow_mode, horizon = key.split("-")
+    return int(stations), flow_mode, horizon
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scaling benchmarks of the packaging station model")
+    parser.add_argument("--stations", type=lambda text: [int(v) for v in text.split(",")],
+                        default=list(STATION_COUNTS), help="comma-separated station counts")
+    parser.add_argument("--flow", choices=FLOW_MODES, action="append", default=None,
+                        help="flow mode to benchmark (repeatable, default: both)")
+    parser.add_argument("--horizon", choices=tuple(HORIZONS), action="append", default=None,
+                        help="horizon to benchmark (repeatable, default: both)")
+    parser.add_argument("--quick", action="store_true", help="skip the 1000-station cases")
+    parser.add_argument("--min-time", type=float, default=DEFAULT_MIN_TIME,
+                        help="repeat a case until its runs add up to this many seconds, keep the median")
+    parser.add_argument("--output", default=None, help="write the results JSON to this file")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline results JSON")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="store the results of the cases run as their new baseline instead of comparing")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown as a fraction of the baseline run time, at least "
+                             f"{SPREAD_TOLERANCE_FACTOR:g}x the case's run time spread")
+    parser.add_argument("--memory-tolerance", type=float, default=0.25,
+                        help="allowed peak RSS growth as a fraction of the baseline")
+    parser.add_argument("--child", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_case(*_parse_case(args.child), min_time=args.min_time)))
+        sys.exit(0)
+
+    station_counts = [count for count in args.stations if not (args.quick and count >= 1000)]
+    cases = all_cases(station_counts, args.flow or FLOW_MODES, args.horizon or tuple(HORIZONS))
+    results = run_suite(cases, args.min_time)
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(results, output_file, indent=2)
+    try:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+    except FileNotFoundError:
+        baseline = {}
+    if args.update_baseline:
+        # Cases that were not run keep their stored baseline
+        baseline_cases = {**baseline.get('cases', {}), **results['cases']}
+        with open(args.baseline, "w") as baseline_file:
+            json.dump({**results, 'cases': baseline_cases}, baseline_file, indent=2)
+        print(f"📌 {len(results['cases'])} baseline cases updated in {args.baseline}")
+        sys.exit(0)
+
+    comparison = BenchmarkComparison(results, baseline, args.tolerance, args.memory_tolerance)
+    print(comparison.format_report())
+    sys.exit(0 if comparison.passed else 1)
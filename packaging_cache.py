@@ -0,0 +1,176 @@
+"""Content-addressed on-disk cache of headless simulation results.
+
+A run is fully determined by the model version, its configuration (flow
+mode, buffer capacity, failure model and every model parameter, defaults
+included), the master seed and the horizon. The SHA-256 of those values
+names a cache entry holding the run's KPI dictionary and, optionally, its
+state trace:
+
+    cache_dir/3f/3f9a.../result.json
+    cache_dir/3f/3f9a.../trace/          (packaging_trace format)
+
+Entries are touched on every hit and the least recently used ones are
+evicted once the cache grows beyond `max_bytes` (down to 90% of it). The cache tree is scanned
+once into an in-memory size/last-use index, which every get and put keeps
+up to date; it is rescanned only when the bound is exceeded, so entries
+added by other processes are accounted for before anything is evicted.
+Unseeded runs are random and never cached.
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+
+from packaging_sim_model import MODEL_VERSION, IndustrialPackagingSimulation
+from packaging_trace import TraceRecorder
+
+RESULT_FILE = "result.json"
+TRACE_DIRECTORY = "trace"
+# Eviction frees the cache down to this share of max_bytes, so a full cache is
+# rescanned once per tenth of its size written rather than on every put
+EVICTION_LOW_WATER = 0.9
+
+def run_config(flow_mode="serial", buffer_capacity=1, failure_model="geometric", parameters=None):
+    """Complete configuration of a run, with every model parameter resolved to its value"""
+    simulation = IndustrialPackagingSimulation(flow_mode, buffer_capacity, 0, failure_model, parameters)
+    return {
+        'flow_mode': flow_mode,
+        'buffer_capacity': buffer_capacity,
+        'failure_model': failure_model,
+        'parameters': simulation.packaging_controller.model_parameters()
+    }
+
+def run_key(config, seed, until):
+    """Stable hash of (model version, full config, seed, horizon)"""
+    identity = {'model_version': MODEL_VERSION, 'config': config, 'seed': seed, 'until': float(until)}
+    return hashlib.sha256(json.dumps(identity, sort_keys=True).encode()).hexdigest()
+
+class ResultCache:
+    """Directory of cached run results with a size bound and LRU eviction"""
+    def __init__(self, directory, max_bytes=512 * 1024 ** 2):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._index = None      # key -> [last use, size in bytes], loaded on first use
+        self._total_bytes = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _entry(self, key):
+        return os.path.join(self.directory, key[:2], key)
+
+    def get(self, key):
+        """Cached result of `key`, or None; a hit marks the entry as recently used"""
+        result_path = os.path.join(self._entry(key), RESULT_FILE)
+        try:
+            with open(result_path) as result_file:
+                result = json.load(result_file)
+            now = time.time()
+            os.utime(result_path, (now, now))
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        record = self._indexed().get(key)
+        if record is not None:
+            record[0] = now
+        return result
+
+    def trace_path(self, key):
+        path = os.path.join(self._entry(key), TRACE_DIRECTORY)
+        return path if os.path.isdir(path) else None
+
+    def put(self, key, result, trace_directory=None):
+        """Store a result (and move a recorded trace into the entry), then enforce the size bound"""
+        entry = self._entry(key)
+        os.makedirs(entry, exist_ok=True)
+        if trace_directory is not None:
+            shutil.rmtree(os.path.join(entry, TRACE_DIRECTORY), ignore_errors=True)
+            shutil.move(trace_directory, os.path.join(entry, TRACE_DIRECTORY))
+
+        # Write-then-rename so concurrent readers never see a partial result
+        handle, temporary_path = tempfile.mkstemp(dir=entry, suffix=".tmp")
+        with os.fdopen(handle, "w") as result_file:
+            json.dump(result, result_file)
+        result_path = os.path.join(entry, RESULT_FILE)
+        os.replace(temporary_path, result_path)
+        
+        index = self._indexed()
+        size = self._entry_size(entry)
+        previous = index.get(key)
+        self._total_bytes += size - (previous[1] if previous else 0)
+        index[key] = [os.stat(result_path).st_mtime, size]
+        if self._total_bytes > self.max_bytes:
+            self.evict()
+
+    @staticmethod
+    def _entry_size(path):
+        return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+
+    def _indexed(self):
+        """The size/last-use index, scanned from disk on first use"""
+        if self._index is None:
+            self._rescan()
+        return self._index
+
+    def _rescan(self):
+        self._index = {os.path.basename(path): [last_used, size] for last_used, size, path in self._entries()}
+        self._total_bytes = sum(size for _, size in self._index.values())
+
+    def _entries(self):
+        """(last use, size, path) of every complete entry, from a full scan of the tree"""
+        entries = []
+        for shard in os.scandir(self.directory):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                try:
+                    last_used = os.stat(os.path.join(entry.path, RESULT_FILE)).st_mtime
+                except OSError:
+                    continue
+                entries.append((last_used, self._entry_size(entry.path), entry.path))
+        return entries
+
+    def size_bytes(self):
+        """Size of the cache as indexed by this instance"""
+        self._indexed()
+        return self._total_bytes
+
+    def evict(self):
+        """Rescan the tree and, if it exceeds max_bytes, remove least recently used
+        entries until it fits in the low-water share of it"""
+        self._rescan()
+        if self._total_bytes <= self.max_bytes:
+            return
+        target = self.max_bytes * EVICTION_LOW_WATER
+        for key, (_, size) in sorted(self._index.items(), key=lambda item: item[1][0]):
+            if self._total_bytes <= target:
+                break
+            shutil.rmtree(self._entry(key), ignore_errors=True)
+            del self._index[key]
+            self._total_bytes -= size
+
+def cached_headless_run(cache, until=8 * 3600, flow_mode="serial", buffer_capacity=1, seed=None,
+                        failure_model="geometric", parameters=None, record_trace=False):
+    """HeadlessRunResult.to_dict() of a run, simulated only if the cache does not have it yet"""
+    key = None
+    if cache is not None and seed is not None:
+        key = run_key(run_config(flow_mode, buffer_capacity, failure_model, parameters), seed, until)
+        result = cache.get(key)
+        if result is not None and (not record_trace or cache.trace_path(key)):
+            return result
+
+    simulation = IndustrialPackagingSimulation(flow_mode, buffer_capacity, seed, failure_model, parameters)
+    trace_directory = None
+    if record_trace and key is not None:
+        trace_directory = tempfile.mkdtemp(prefix="trace-", dir=cache.directory)
+        recorder = TraceRecorder(simulation.env, trace_directory)
+        recorder.attach(simulation.packaging_controller.state_sources())
+    result = simulation.run_headless_simulation(until).to_dict()
+    if trace_directory is not None:
+        recorder.close()
+    if key is not None:
+        cache.put(key, result, trace_directory)
+    return result
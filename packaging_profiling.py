@@ -0,0 +1,215 @@
+"""Opt-in profiling of SimPy models, per generator.
+
+SimProfiler wraps one environment's schedule() and step(): every scheduled
+event is counted against the process that was active when it was scheduled,
+every process resume is counted and timed against the process's generator
+(e.g. `_process_folding_command`, `kpi_process`), and the event heap size is
+sampled as the run goes. format_report() ranks generators by wall time spent
+resuming them.
+
+    python packaging_sim_node.py --headless --until 604800 --profile
+
+The version 5 components profile themselves when PACKAGING_SIM_PROFILE is set
+and this module is importable (add the repository root to PYTHONPATH). The
+report is written at exit, to stderr for "1" and appended to the file named
+otherwise:
+
+    PACKAGING_SIM_PROFILE=plc_profile.txt PYTHONPATH=/path/to/repo python3 PLCComponent.py
+"""
+import atexit
+import os
+import sys
+import time
+from array import array
+
+from simpy.events import NORMAL, Process
+
+PROFILE_VARIABLE = "PACKAGING_SIM_PROFILE"
+KERNEL = "<kernel>"
+
+# =====================================================
+# ----------- Generator Statistics --------------------
+# =====================================================
+
+class GeneratorStats:
+    """Counters of one generator, summed over all its processes"""
+    __slots__ = ('name', 'scheduled', 'resumes', 'wall_time')
+
+    def __init__(self, name):
+        self.name = name
+        self.scheduled = 0
+        self.resumes = 0
+        self.wall_time = 0.0
+
+    @property
+    def mean_resume_time(self):
+        return self.wall_time / self.resumes if self.resumes else 0.0
+
+    def to_dict(self):
+        return {'name': self.name, 'scheduled': self.scheduled, 'resumes': self.resumes,
+                'wall_time': self.wall_time, 'mean_resume_time': self.mean_resume_time}
+
+class _TimedCallback:
+    """Event callback that charges its wall time to a generator"""
+    __slots__ = ('callback', 'stats')
+
+    def __init__(self, callback, stats):
+        self.callback = callback
+        self.stats = stats
+
+    def __call__(self, event):
+        start = time.perf_counter()
+        try:
+            self.callback(event)
+        finally:
+            self.stats.resumes += 1
+            self.stats.wall_time += time.perf_counter() - start
+
+# =====================================================
+# ----------- SimPy Profiler --------------------------
+# =====================================================
+
+class SimProfiler:
+    """Per-generator event counts and resume times of one simpy.Environment.
+
+    Heap sizes are sampled every `sample_every` steps; once `max_samples`
+    are held, every other sample is dropped and the stride doubles, so
+    memory stays bounded however long the run is.
+    """
+    def __init__(self, env, sample_every=1000, max_samples=4096):
+        self.env = env
+        self.sample_every = sample_every
+        self.max_samples = max_samples
+        self.generators = {}
+        self.steps = 0
+        self.step_time = 0.0
+        self.peak_heap_size = 0
+        self.sample_times = array('d')
+        self.heap_sizes = array('L')
+        self._installed = False
+
+    def _stats(self, name):
+        stats = self.generators.get(name)
+        if stats is None:
+            stats = self.generators[name] = GeneratorStats(name)
+        return stats
+
+    def _callback_name(self, callback):
+        owner = getattr(callback, '__self__', None)
+        if isinstance(owner, Process):
+            return owner.name
+        return f"<{getattr(callback, '__qualname__', type(callback).__name__)}>"
+
+    def install(self):
+        """Start profiling; returns self so it chains onto the constructor"""
+        if self._installed:
+            return self
+        env = self.env
+        original_schedule, original_step = env.schedule, env.step
+        queue = env._queue
+
+        def schedule(event, priority=NORMAL, delay=0):
+            active = env.active_process
+            self._stats(active.name if active is not None else KERNEL).scheduled += 1
+            original_schedule(event, priority, delay)
+
+        def step():
+            if queue:
+                event = queue[0][3]
+                callbacks = event.callbacks
+                if callbacks:
+                    event.callbacks = [callback if isinstance(callback, _TimedCallback)
+                                       else _TimedCallback(callback, self._stats(self._callback_name(callback)))
+                                       for callback in callbacks]
+            self.steps += 1
+            if self.steps % self.sample_every == 0:
+                self._sample(len(queue))
+            start = time.perf_counter()
+            try:
+                original_step()
+            finally:
+                self.step_time += time.perf_counter() - start
+
+        env.schedule, env.step = schedule, step
+        self._installed = True
+        return self
+
+    def uninstall(self):
+        """Stop profiling and restore the environment's own methods"""
+        if not self._installed:
+            return
+        del self.env.schedule, self.env.step
+        self._installed = False
+
+    def _sample(self, heap_size):
+        self.peak_heap_size = max(self.peak_heap_size, heap_size)
+        self.sample_times.append(self.env.now)
+        self.heap_sizes.append(heap_size)
+        if len(self.heap_sizes) >= self.max_samples:
+            self.sample_times = self.sample_times[::2]
+            self.heap_sizes = self.heap_sizes[::2]
+            self.sample_every *= 2
+
+    def ranked(self):
+        """Generator statistics, most wall time first"""
+        return sorted(self.generators.values(), key=lambda stats: stats.wall_time, reverse=True)
+
+    @property
+    def kernel_time(self):
+        """Step time not spent inside event callbacks (heap operations, bookkeeping)"""
+        return self.step_time - sum(stats.wall_time for stats in self.generators.values())
+
+    def to_dict(self):
+        return {
+            'steps': self.steps,
+            'step_time': self.step_time,
+            'kernel_time': self.kernel_time,
+            'peak_heap_size': self.peak_heap_size,
+            'generators': [stats.to_dict() for stats in self.ranked()],
+            'heap_samples': list(zip(self.sample_times, self.heap_sizes))
+        }
+
+    def format_report(self, limit=20, heap_rows=10):
+        lines = [f"⏱️ SimPy profile: {self.steps} events processed in {self.step_time:.2f} s "
+                 f"(sim time {self.env.now:.0f} s)"]
+        lines.append(f"   {'generator':<36} {'resumes':>10} {'scheduled':>10} {'total s':>9} "
+                     f"{'mean µs':>9} {'share':>6}")
+        for stats in self.ranked()[:limit]:
+            share = stats.wall_time / self.step_time if self.step_time > 0 else 0.0
+            lines.append(f"   {stats.name[:36]:<36} {stats.resumes:>10} {stats.scheduled:>10} "
+                         f"{stats.wall_time:>9.3f} {stats.mean_resume_time * 1e6:>9.1f} {share:>6.1%}")
+        if len(self.generators) > limit:
+            lines.append(f"   ... {len(self.generators) - limit} more")
+        lines.append(f"   kernel overhead: {self.kernel_time:.3f} s")
+
+        if self.heap_sizes:
+            mean_heap = sum(self.heap_sizes) / len(self.heap_sizes)
+            lines.append(f"📚 Event heap: peak {self.peak_heap_size}, mean {mean_heap:.0f} "
+                         f"({len(self.heap_sizes)} samples)")
+            stride = -(-len(self.heap_sizes) // heap_rows)
+            for index in range(0, len(self.heap_sizes), stride):
+                size = self.heap_sizes[index]
+                bar = "#" * round(40 * size / self.peak_heap_size) if self.peak_heap_size else ""
+                lines.append(f"   t={self.sample_times[index]:>12.1f} s {size:>7} {bar}")
+        return "\n".join(lines)
+
+    def dump(self, destination="1", label=None):
+        """Write the report to stderr ("1") or append it to the file `destination`"""
+        self.uninstall()
+        report = self.format_report()
+        if label:
+            report = f"=== {label} (pid {os.getpid()}) ===\n{report}"
+        if destination in ("1", "stderr"):
+            print(report, file=sys.stderr)
+        else:
+            with open(destination, "a") as report_file:
+                report_file.write(report + "\n")
+
+def profile_from_environment(env, label=None):
+    """Profile `env` if PACKAGING_SIM_PROFILE is set and dump the report at exit; else None"""
+    destination = os.environ.get(PROFILE_VARIABLE)
+    if not destination:
+        return None
+    profiler = SimProfiler(env).install()
+    atexit.register(profiler.dump, destination, label)
+    return profiler
@@ -0,0 +1,224 @@
+"""Monte Carlo replications of the packaging station model.
+
+Failures and repair durations are random, so a single run says little about
+the station.  This module runs N independently seeded headless copies of
+PackagingStationController across a process pool and summarises throughput,
+availability, MTTR and OEE with Student-t confidence intervals.
+
+    python packaging_replications.py --replications 200 --until 28800
+
+With --tolerance the runner stops on precision instead of a fixed count: it
+launches batches until the confidence interval of --target-kpi is narrower
+than the tolerance and reports how many replications that took.
+
+    python packaging_replications.py --target-kpi oee --tolerance 0.005
+"""
+import argparse
+import math
+import os
+import random
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from packaging_sim_model import FailureConfiguration, IndustrialPackagingSimulation, PackagingStationController
+
+REPLICATION_KPIS = ('throughput_per_hour', 'availability', 'mttr', 'oee')
+
+# =====================================================
+# ----------- Confidence Intervals --------------------
+# =====================================================
+
+def student_t_quantile(p, df):
+    """Quantile of Student's t distribution (Cornish-Fisher expansion for df >= 3)"""
+    if df == 1:
+        return math.tan(math.pi * (p - 0.5))
+    if df == 2:
+        return (2 * p - 1) / math.sqrt(2 * p * (1 - p))
+
+    z = statistics.NormalDist().inv_cdf(p)
+    g1 = (z ** 3 + z) / 4
+    g2 = (5 * z ** 5 + 16 * z ** 3 + 3 * z) / 96
+    g3 = (3 * z ** 7 + 19 * z ** 5 + 17 * z ** 3 - 15 * z) / 384
+    g4 = (79 * z ** 9 + 776 * z ** 7 + 1482 * z ** 5 - 1920 * z ** 3 - 945 * z) / 92160
+    return z + g1 / df + g2 / df ** 2 + g3 / df ** 3 + g4 / df ** 4
+
+class ConfidenceInterval:
+    """Two-sided Student-t confidence interval of a sample mean"""
+    def __init__(self, mean, half_width, n, confidence):
+        self.mean = mean
+        self.half_width = half_width
+        self.n = n
+        self.confidence = confidence
+
+    @classmethod
+    def from_samples(cls, samples, confidence=0.95):
+        values = [v for v in samples if not math.isnan(v)]
+        if not values:
+            return cls(float('nan'), float('nan'), 0, confidence)
+        if len(values) == 1:
+            return cls(values[0], float('inf'), 1, confidence)
+
+        t = student_t_quantile(0.5 + confidence / 2, len(values) - 1)
+        half_width = t * statistics.stdev(values) / math.sqrt(len(values))
+        return cls(statistics.fmean(values), half_width, len(values), confidence)
+
+    @property
+    def lower(self):
+        return self.mean - self.half_width
+
+    @property
+    def upper(self):
+        return self.mean + self.half_width
+
+    def to_dict(self):
+        return {'mean': self.mean, 'half_width': self.half_width, 'lower': self.lower,
+                'upper': self.upper, 'n': self.n, 'confidence': self.confidence}
+
+    def __repr__(self):
+        return f"{self.mean:.4g} ± {self.half_width:.3g} (n={self.n}, {self.confidence:.0%})"
+
+# =====================================================
+# ----------- Replication Runner ----------------------
+# =====================================================
+
+def run_replication(seed, until, flow_mode="serial", failure_model="geometric"):
+    """Simulate one independently seeded station; runs inside a pool worker"""
+    simulation = IndustrialPackagingSimulation(flow_mode, seed=seed, failure_model=failure_model)
+    result = simulation.run_headless_simulation(until)
+    return result.to_dict()
+
+class ReplicationSummary:
+    """Per-replication samples plus confidence intervals of the headline KPIs"""
+    def __init__(self, samples, until, base_seed, confidence, wall_time, stopping_rule=None):
+        self.samples = samples
+        self.until = until
+        self.base_seed = base_seed
+        self.confidence = confidence
+        self.wall_time = wall_time
+        self.stopping_rule = stopping_rule
+        self.intervals = {
+            kpi: ConfidenceInterval.from_samples([s[kpi] for s in samples], confidence)
+            for kpi in REPLICATION_KPIS
+        }
+
+    @property
+    def replications(self):
+        return len(self.samples)
+
+    def format_report(self):
+        lines = [f"🎲 {self.replications} replications of {self.until / 3600:.2f} h "
+                 f"in {self.wall_time:.1f} s (base seed {self.base_seed})"]
+        for kpi, interval in self.intervals.items():
+            lines.append(f"   {kpi}: {interval!r}")
+        if self.stopping_rule is not None:
+            lines.append(f"🎯 {self.stopping_rule.describe(self.intervals[self.stopping_rule.kpi])}")
+        return "\n".join(lines)
+
+def run_replications(replications, until=8 * 3600, base_seed=None, workers=None, confidence=0.95,
+                     flow_mode="serial", failure_model="geometric"):
+    """Run `replications` seeded copies of the station across all cores"""
+    if base_seed is None:
+        base_seed = random.SystemRandom().randrange(2 ** 32)
+    workers = workers or os.cpu_count() or 1
+    seeds = [base_seed + i for i in range(replications)]
+
+    wall_clock_start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        samples = list(pool.map(partial(run_replication, until=until, flow_mode=flow_mode,
+                                        failure_model=failure_model), seeds,
+                                chunksize=max(1, replications // (workers * 4))))
+
+    return ReplicationSummary(samples, until, base_seed, confidence,
+                              time.perf_counter() - wall_clock_start)
+
+# =====================================================
+# ----------- Sequential Stopping ---------------------
+# =====================================================
+
+class PrecisionStoppingRule:
+    """Stop once the confidence interval half-width of `kpi` is at most `tolerance`
+    (a fraction of the mean when `relative`), or after `max_replications`"""
+    def __init__(self, kpi, tolerance, relative=False, min_replications=10, max_replications=10000):
+        if kpi not in REPLICATION_KPIS:
+            raise ValueError(f"Unknown KPI {kpi!r}, expected one of {REPLICATION_KPIS}")
+        self.kpi = kpi
+        self.tolerance = tolerance
+        self.relative = relative
+        self.min_replications = min_replications
+        self.max_replications = max_replications
+
+    def allowed_half_width(self, interval):
+        return self.tolerance * abs(interval.mean) if self.relative else self.tolerance
+
+    def satisfied(self, interval):
+        return (interval.n >= self.min_replications and
+                interval.half_width <= self.allowed_half_width(interval))
+
+    def describe(self, interval):
+        if self.satisfied(interval):
+            return (f"{self.kpi} half-width {interval.half_width:.3g} <= {self.allowed_half_width(interval):.3g} "
+                    f"after {interval.n} replications")
+        return (f"{self.kpi} half-width {interval.half_width:.3g} still above "
+                f"{self.allowed_half_width(interval):.3g} after {interval.n} replications (limit reached)")
+
+def run_sequential_replications(stopping_rule, until=8 * 3600, base_seed=None, workers=None,
+                                confidence=0.95, flow_mode="serial", failure_model="geometric",
+                                batch_size=None):
+    """Launch batches of seeded replications until `stopping_rule` is satisfied.
+    
+    Seeds are still base_seed + i, so the first n replications are the same
+    runs a fixed-count run_replications(n) would make.
+    """
+    if base_seed is None:
+        base_seed = random.SystemRandom().randrange(2 ** 32)
+    workers = workers or os.cpu_count() or 1
+    batch_size = batch_size or 2 * workers
+    run = partial(run_replication, until=until, flow_mode=flow_mode, failure_model=failure_model)
+
+    wall_clock_start = time.perf_counter()
+    samples = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while len(samples) < stopping_rule.max_replications:
+            wanted = max(batch_size, stopping_rule.min_replications - len(samples))
+            wanted = min(wanted, stopping_rule.max_replications - len(samples))
+            seeds = range(base_seed + len(samples), base_seed + len(samples) + wanted)
+            samples.extend(pool.map(run, seeds))
+            
+            interval = ConfidenceInterval.from_samples([s[stopping_rule.kpi] for s in samples], confidence)
+            if stopping_rule.satisfied(interval):
+                break
+
+    return ReplicationSummary(samples, until, base_seed, confidence,
+                              time.perf_counter() - wall_clock_start, stopping_rule)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Monte Carlo replications of the packaging station")
+    parser.add_argument("-n", "--replications", type=int, default=100,
+                        help="replication count (with --tolerance: the minimum before stopping)")
+    parser.add_argument("--until", type=float, default=8 * 3600, help="horizon per replication in seconds")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="base seed; replication i uses master seed seed + i")
+    parser.add_argument("--workers", type=int, default=None, help="pool size (default: all cores)")
+    parser.add_argument("--confidence", type=float, default=0.95)
+    parser.add_argument("--flow", choices=PackagingStationController.FLOW_MODES, default="serial")
+    parser.add_argument("--failure-model", choices=FailureConfiguration.FAILURE_MODELS, default="geometric")
+    parser.add_argument("--tolerance", type=float, default=None,
+                        help="run until the confidence half-width of --target-kpi is at most this")
+    parser.add_argument("--relative", action="store_true", help="tolerance is a fraction of the mean")
+    parser.add_argument("--target-kpi", choices=REPLICATION_KPIS, default="throughput_per_hour")
+    parser.add_argument("--max-replications", type=int, default=10000)
+    parser.add_argument("--batch-size", type=int, default=None,
+                        help="replications launched between precision checks (default: twice the pool)")
+    args = parser.parse_args()
+
+    if args.tolerance is None:
+        summary = run_replications(args.replications, args.until, args.seed, args.workers, args.confidence,
+                                   args.flow, args.failure_model)
+    else:
+        rule = PrecisionStoppingRule(args.target_kpi, args.tolerance, args.relative,
+                                     min(args.replications, args.max_replications), args.max_replications)
+        summary = run_sequential_replications(rule, args.until, args.seed, args.workers, args.confidence,
+                                              args.flow, args.failure_model, args.batch_size)
+    print(summary.format_report())
@@ -0,0 +1,2217 @@
+"""Qt-free model of the packaging station: components, human resources,
+controller, KPIs, headless and plant runners and the analytic estimate.
+
+Importing it needs only SimPy, so batch tools and pool workers start fast.
+"""
+import hashlib
+import math
+import simpy
+import random
+import time
+import threading
+from array import array
+from collections import namedtuple
+from enum import IntEnum
+from packaging_profiling import SimProfiler
+from packaging_trace import TraceRecorder
+
+# Bump whenever a change alters simulated results; cached runs of older versions are ignored
+MODEL_VERSION = "3"
+
+# =====================================================
+# ----------- Random Streams --------------------------
+# =====================================================
+
+class RandomStreams:
+    """Independent random.Random streams derived from one master seed.
+    
+    Every failure source, repair/refill timer and arrival process draws from
+    its own named stream, so results do not depend on the order in which
+    components happen to draw. Two runs with the same master seed see the
+    same random numbers per component (common random numbers).
+    """
+    def __init__(self, master_seed=None):
+        if master_seed is None:
+            master_seed = random.SystemRandom().randrange(2 ** 63)
+        self.master_seed = master_seed
+        self._streams = {}
+
+    def derive_seed(self, stream_name):
+        digest = hashlib.sha256(f"{self.master_seed}:{stream_name}".encode()).digest()
+        return int.from_bytes(digest[:8], "big")
+
+    def stream(self, stream_name):
+        rng = self._streams.get(stream_name)
+        if rng is None:
+            rng = self._streams[stream_name] = random.Random(self.derive_seed(stream_name))
+        return rng
+
+# =====================================================
+# ----------- Failure Configuration -------------------
+# =====================================================
+
+class FailureSchedule:
+    """Pre-drawn failure points of one machine.
+    
+    Count-based schedules store the index of the operation check at which
+    the next failure occurs; time-based schedules store the sim time from
+    which the next check fails. Gaps are drawn in batches so a check is a
+    single comparison most of the time.
+    """
+    __slots__ = ('draw_batch', 'checks', 'next_failure', 'pending_gaps')
+
+    def __init__(self, draw_batch):
+        self.draw_batch = draw_batch
+        self.checks = 0
+        self.next_failure = 0
+        self.pending_gaps = []
+        self.advance(0)
+
+    def advance(self, origin):
+        if not self.pending_gaps:
+            self.pending_gaps = self.draw_batch()
+            self.pending_gaps.reverse()
+        self.next_failure = origin + self.pending_gaps.pop()
+
+class FailureConfiguration:
+    """Centralized failure configuration - MAX 3% per operation check.
+    
+    failure_model selects how failures are drawn:
+      "bernoulli" - an independent coin flip with `failure_chances` at every check
+      "geometric" - same distribution as "bernoulli", but the number of checks
+                    until the next failure is pre-drawn (default)
+      "mtbf"      - exponential time between failures with mean `mtbf_seconds`
+      "weibull"   - Weibull time between failures (`weibull_parameters` as
+                    (scale, shape); shape > 1 models wear-out)
+    Time-based models need `env` and fail at the first check after the drawn
+    time. Call reset_schedules() after changing parameters mid-run.
+    """
+    FAILURE_MODELS = ("bernoulli", "geometric", "mtbf", "weibull")
+    SCHEDULE_BATCH_SIZE = 64
+
+    def __init__(self, random_streams=None, stream_prefix="", failure_model="geometric", env=None):
+        if failure_model not in self.FAILURE_MODELS:
+            raise ValueError(f"Unknown failure model {failure_model!r}, expected one of {self.FAILURE_MODELS}")
+        if failure_model in ("mtbf", "weibull") and env is None:
+            raise ValueError(f"The {failure_model!r} failure model needs a simulation environment")
+        self.random_streams = random_streams or RandomStreams()
+        self.stream_prefix = stream_prefix
+        self.failure_model = failure_model
+        self.env = env
+        self.failure_chances = {
+            'product_loader': 2,    # 2% failure chance
+            'flap_folding': 1,      # 1% failure chance  
+            'tape_sealing': 3,      # 3% failure chance (MAX)
+            'label_applicator': 1,  # 1% failure chance
+            'conveyor': 0.5         # 0.5% failure chance
+        }
+        # Roughly matches the per-check chances at the nominal serial cycle
+        self.mtbf_seconds = {
+            'product_loader': 700,
+            'flap_folding': 310,
+            'tape_sealing': 470,
+            'label_applicator': 1400,
+            'conveyor': 2800
+        }
+        self.weibull_parameters = {
+            machine_type: (mtbf / math.gamma(1.5), 2.0) for machine_type, mtbf in self.mtbf_seconds.items()
+        }
+        self._schedules = {}
+
+    def reset_schedules(self):
+        self._schedules.clear()
+
+    def _stream(self, machine_type):
+        return self.random_streams.stream(f"{self.stream_prefix}{machine_type}.failures")
+
+    def _schedule_for(self, machine_type):
+        rng = self._stream(machine_type)
+        batch_size = self.SCHEDULE_BATCH_SIZE
+        
+        if self.failure_model == "geometric":
+            chance = self.failure_chances.get(machine_type, 0) / 100.0
+            if chance <= 0:
+                draw_batch = lambda: [math.inf]
+            elif chance >= 1:
+                draw_batch = lambda: [1] * batch_size
+            else:
+                log_survival = math.log1p(-chance)
+                draw_batch = lambda: [int(math.log(1.0 - rng.random()) / log_survival) + 1
+                                      for _ in range(batch_size)]
+        elif self.failure_model == "mtbf":
+            mean = self.mtbf_seconds.get(machine_type, math.inf)
+            draw_batch = lambda: [rng.expovariate(1.0 / mean) if mean < math.inf else math.inf
+                                  for _ in range(batch_size)]
+        else:
+            scale, shape = self.weibull_parameters.get(machine_type, (math.inf, 1.0))
+            draw_batch = lambda: [rng.weibullvariate(scale, shape) for _ in range(batch_size)]
+        
+        schedule = self._schedules[machine_type] = FailureSchedule(draw_batch)
+        return schedule
+
+    def should_fail(self, machine_type):
+        """Check if a machine should fail at this operation check"""
+        if self.failure_model == "bernoulli":
+            chance = self.failure_chances.get(machine_type, 0)
+            return self._stream(machine_type).random() * 100 < chance
+        
+        schedule = self._schedules.get(machine_type) or self._schedule_for(machine_type)
+        if self.failure_model == "geometric":
+            schedule.checks += 1
+            if schedule.checks < schedule.next_failure:
+                return False
+            schedule.advance(schedule.checks)
+            return True
+        
+        now = self.env.now
+        if now < schedule.next_failure:
+            return False
+        schedule.advance(now)
+        return True
+
+# =====================================================
+# ----------- Human Resources -------------------------
+# =====================================================
+
+class HumanResource:
+    """Human worker (or crew of `capacity` interchangeable workers) serving
+    requests from a SimPy priority queue.
+    
+    Requests are served first-come-first-served within a priority level (lower
+    value = more urgent). With `preemptive=True` an urgent request interrupts a
+    less urgent job, which is re-queued at the head of its priority level with
+    its remaining work. Waiting costs no events; queue length and wait times
+    are accumulated exactly at each queue change.
+    """
+    def __init__(self, env, name, priorities=None, preemptive=False, capacity=1, random_streams=None):
+        self.env = env
+        self.name = name
+        self.random_streams = random_streams or RandomStreams()
+        self.resource = simpy.PreemptiveResource(env, capacity=capacity)
+        self.priorities = priorities or {}
+        self.preemptive = preemptive
+        self.active_tasks = []
+        self.worker_tasks = [None] * capacity
+        self.state_listeners = []
+        self.job_queue = []
+        self.busy_workers = 0
+        self._busy_worker_area = 0.0
+        self._busy_changed_at = env.now
+        self.completed_jobs = 0
+        self.preempted_jobs = 0
+        
+        # Queue statistics (jobs waiting, not in service)
+        self.queue_length = 0
+        self.max_queue_length = 0
+        self._queue_length_area = 0.0
+        self._queue_changed_at = env.now
+        self.total_wait_time = 0.0
+        self.max_wait_time = 0.0
+
+    @property
+    def capacity(self):
+        return self.resource.capacity
+
+    @property
+    def available(self):
+        return self.resource.count < self.resource.capacity
+
+    @property
+    def current_task(self):
+        return ", ".join(self.active_tasks) if self.active_tasks else "IDLE"
+
+    def worker_name(self, slot):
+        return f"{self.name}[{slot}]" if self.capacity > 1 else self.name
+
+    def current_states(self):
+        """(entity, state) of every worker, for state listeners that attach mid-run"""
+        return [(self.worker_name(slot), task or "IDLE") for slot, task in enumerate(self.worker_tasks)]
+
+    def _set_worker_task(self, slot, task):
+        self.worker_tasks[slot] = task
+        for listener in self.state_listeners:
+            listener(self.worker_name(slot), task or "IDLE")
+
+    def utilization(self):
+        """Fraction of elapsed worker time spent working"""
+        area = self._busy_worker_area + self.busy_workers * (self.env.now - self._busy_changed_at)
+        return area / (self.capacity * self.env.now) if self.env.now > 0 else 0.0
+
+    def _change_busy_workers(self, delta):
+        now = self.env.now
+        self._busy_worker_area += self.busy_workers * (now - self._busy_changed_at)
+        self._busy_changed_at = now
+        self.busy_workers += delta
+
+    def mean_queue_length(self):
+        """Time-averaged number of waiting requests"""
+        area = self._queue_length_area + self.queue_length * (self.env.now - self._queue_changed_at)
+        return area / self.env.now if self.env.now > 0 else 0.0
+
+    def mean_wait_time(self):
+        return self.total_wait_time / self.completed_jobs if self.completed_jobs else 0.0
+
+    def queue_statistics(self):
+        return {
+            'mean_queue_length': self.mean_queue_length(),
+            'max_queue_length': self.max_queue_length,
+            'mean_wait_time': self.mean_wait_time(),
+            'max_wait_time': self.max_wait_time,
+            'completed_jobs': self.completed_jobs,
+            'preempted_jobs': self.preempted_jobs
+        }
+
+    def _change_queue_length(self, delta):
+        now = self.env.now
+        self._queue_length_area += self.queue_length * (now - self._queue_changed_at)
+        self._queue_changed_at = now
+        self.queue_length += delta
+        self.max_queue_length = max(self.max_queue_length, self.queue_length)
+
+    def _serve(self, job_type, machine_name, task, service_time):
+        job = (job_type, machine_name)
+        self.job_queue.append(job)
+        base_priority = self.priorities.get(job_type, 0)
+        priority = base_priority
+        remaining_time = service_time
+        waited_time = 0.0
+        
+        preempt = self.preemptive
+        while remaining_time > 0:
+            with self.resource.request(priority=priority, preempt=preempt) as request:
+                queued_at = self.env.now
+                must_wait = not request.triggered
+                if must_wait:
+                    self._change_queue_length(1)
+                yield request
+                if must_wait:
+                    self._change_queue_length(-1)
+                waited_time += self.env.now - queued_at
+                
+                self.active_tasks.append(task)
+                slot = self.worker_tasks.index(None)
+                self._set_worker_task(slot, task)
+                self._change_busy_workers(1)
+                started_at = self.env.now
+                try:
+                    yield self.env.timeout(remaining_time)
+                    remaining_time = 0
+                except simpy.Interrupt:
+                    remaining_time -= self.env.now - started_at
+                    self.preempted_jobs += 1
+                    # Resume ahead of jobs of the same priority, without preempting them
+                    priority = base_priority - 0.5
+                    preempt = False
+                finally:
+                    self._change_busy_workers(-1)
+                    self.active_tasks.remove(task)
+                    self._set_worker_task(slot, None)
+        
+        self.completed_jobs += 1
+        self.total_wait_time += waited_time
+        self.max_wait_time = max(self.max_wait_time, waited_time)
+        self.job_queue.remove(job)
+        return True
+
+class MaintenanceOperator(HumanResource):
+    """Human operator that handles machine repairs"""
+    def __init__(self, env, name="Maintenance Operator", priorities=None, preemptive=False, capacity=1,
+                 random_streams=None):
+        super().__init__(env, name, priorities, preemptive, capacity, random_streams)
+        self.repair_times = {
+            'product_loader': (8, 15),
+            'flap_folding': (10, 18),  
+            'tape_sealing': (6, 12),
+            'label_applicator': (4, 8),
+            'conveyor': (3, 6)
+        }
+
+    @property
+    def repair_queue(self):
+        return self.job_queue
+
+    def request_repair(self, machine_type, machine_name):
+        repair_time_range = self.repair_times.get(machine_type, (5, 10))
+        rng = self.random_streams.stream(f"{machine_name}.repair")
+        repair_time = rng.uniform(repair_time_range[0], repair_time_range[1])
+        return self.env.process(self._serve(machine_type, machine_name,
+                                            f"REPAIRING_{machine_type.upper()}", repair_time))
+
+class MaterialHandler(HumanResource):
+    """Human worker that handles material refills when requested"""
+    def __init__(self, env, name="Material Handler", priorities=None, preemptive=False, capacity=1,
+                 random_streams=None):
+        super().__init__(env, name, priorities, preemptive, capacity, random_streams)
+        self.refill_times = {
+            'tape_refill': (10, 20),    # 10-20 seconds to refill tape
+            'label_refill': (8, 15)     # 8-15 seconds to refill labels
+        }
+
+    @property
+    def refill_queue(self):
+        return self.job_queue
+
+    def request_refill(self, material_type, machine_name):
+        refill_time_range = self.refill_times.get(material_type, (10, 15))
+        rng = self.random_streams.stream(f"{machine_name}.{material_type}")
+        refill_time = rng.uniform(refill_time_range[0], refill_time_range[1])
+        return self.env.process(self._serve(material_type, machine_name,
+                                            f"REFILLING_{material_type.upper()}", refill_time))
+
+# =====================================================
+# ----------- State Codes -----------------------------
+# =====================================================
+
+class OperationalState(IntEnum):
+    """States of the station and its modules as small integer codes.
+
+    One enum covers station and module states so codes never collide in a
+    trace; the model only compares codes and names are rendered for display.
+    """
+    # Station
+    STATION_IDLE = 0
+    PROCESSING_ACTIVE = 1
+    LOADING_PRODUCT = 2
+    FOLDING_FLAPS = 3
+    SEALING_CARTON = 4
+    APPLYING_LABEL = 5
+    CONVEYOR_OPERATING = 6
+    RESETTING_STATION = 7
+    AWAITING_MATERIALS = 8
+    PIPELINE_ACTIVE = 9
+    STATION_FAILED = 10
+    # Modules
+    MODULE_FAILED = 20
+    MODULE_STANDBY = 21
+    LOADING_IN_PROGRESS = 22
+    PRODUCT_LOADED = 23
+    LOADING_FAILED = 24
+    FLAPS_EXTENDED = 30
+    FOLDING_IN_PROGRESS = 31
+    ALL_FLAPS_FOLDED = 32
+    FOLDING_FAILED = 33
+    SEALER_READY = 40
+    SEALING_IN_PROGRESS = 41
+    CARTON_SEALED = 42
+    AWAITING_TAPE_REFILL = 43
+    SEALING_FAILED = 44
+    LABELER_READY = 50
+    LABELING_IN_PROGRESS = 51
+    LABEL_APPLIED = 52
+    AWAITING_LABEL_REFILL = 53
+    LABELING_FAILED = 54
+    CONVEYOR_STOPPED = 60
+    CONVEYOR_RUNNING = 61
+    CONVEYOR_FAILED = 62
+
+# Serial-flow station states with a carton inside the station
+WORK_IN_PROGRESS_STATES = frozenset((
+    OperationalState.PROCESSING_ACTIVE, OperationalState.LOADING_PRODUCT, OperationalState.FOLDING_FLAPS,
+    OperationalState.SEALING_CARTON, OperationalState.APPLYING_LABEL, OperationalState.CONVEYOR_OPERATING))
+
+class FlapState(IntEnum):
+    EXTENDED = 0
+    FOLDING = 1
+    FOLDED = 2
+
+class FoldingPhase(IntEnum):
+    AWAITING_START = 0
+    LOWER_PHASE = 1
+    UPPER_PHASE = 2
+    COMPLETE = 3
+
+class FoldingOperation(IntEnum):
+    AWAITING_CARTON = 0
+    FOLDING_LOWER_FLAPS = 1
+    COMPRESSING_BOTTOM = 2
+    FOLDING_UPPER_FLAPS = 3
+    FINAL_COMPRESSION = 4
+    SEQUENCE_COMPLETED = 5
+
+# Folding sequence; also the index order of the flap state arrays
+FLAP_ORDER = ('front', 'back', 'left', 'right')
+
+def state_name(state):
+    """Display name of a state code; anything else (worker tasks, trace names) passes through"""
+    return state.name if isinstance(state, IntEnum) else state
+
+# =====================================================
+# ----------- Industrial Packaging Components ---------
+# =====================================================
+
+class CartonPresenceDetector:
+    """Industrial photoelectric sensor for carton detection.
+    
+    The infeed is modelled as a sensor scanned once per second: an empty
+    pocket receives a carton with `arrival_probability` per scan and an
+    unclaimed carton leaves with `departure_probability` per scan. Instead of
+    simulating every scan, the detector jumps straight to the next presence
+    change and fires `carton_arrived` when a carton shows up.
+    """
+    __slots__ = ('env', 'name', 'rng', 'carton_present', 'carton_counter', 'missed_cartons',
+                 'carton_arrived', '_carton_taken')
+    scan_interval = 1.0
+    arrival_probability = 0.12
+    departure_probability = 0.15
+
+    def __init__(self, env, name, rng=None):
+        self.env = env
+        self.name = name
+        self.rng = rng or random.Random()
+        self.carton_present = False
+        self.carton_counter = 0
+        self.missed_cartons = 0
+        self.carton_arrived = env.event()
+        self._carton_taken = None
+
+    @property
+    def detection_status(self):
+        if self.carton_present:
+            return f"CARTON_{self.carton_counter:03d}_DETECTED"
+        return "NO_CARTON_DETECTED"
+
+    def _scans_until(self, probability):
+        """Number of unsuccessful scans before an outcome with the given per-scan probability"""
+        return int(math.log(1.0 - self.rng.random()) / math.log(1.0 - probability))
+
+    def take_carton(self):
+        """The station pulls the detected carton off the infeed"""
+        if self.carton_present:
+            self._carton_taken.succeed()
+            self._clear_carton()
+
+    def _clear_carton(self):
+        self.carton_present = False
+
+    def generate_detection_data(self):
+        yield self.env.timeout(self._scans_until(self.arrival_probability) * self.scan_interval)
+        while True:
+            self.carton_present = True
+            self.carton_counter += 1
+            self._carton_taken = self.env.event()
+            arrived, self.carton_arrived = self.carton_arrived, self.env.event()
+            arrived.succeed()
+            
+            departure_delay = (1 + self._scans_until(self.departure_probability)) * self.scan_interval
+            yield self.env.timeout(departure_delay) | self._carton_taken
+            if self.carton_present:
+                self.missed_cartons += 1
+                self._clear_carton()
+            
+            yield self.env.timeout((1 + self._scans_until(self.arrival_probability)) * self.scan_interval)
+
+class StationModule:
+    """Common failure handling and downtime accounting for station modules"""
+    __slots__ = ('env', 'name', 'failure_config', 'maintenance_operator', 'has_failure', 'failure_message',
+                 'failure_count', 'downtime_total', '_failure_started_at', 'repaired_event',
+                 'failure_observer', 'state_listeners', '_operational_state')
+    machine_type = None
+    failed_state = OperationalState.MODULE_FAILED
+    # Work (seconds) after each failure check of one carton, as in _process_*_command
+    failure_check_segments = ()
+    nominal_cycle_time = 0.0    # seconds per carton without failures or refills
+    refill_material = None      # material the handler refills when the module runs out
+
+    @property
+    def material_capacity(self):
+        return None
+
+    def __init__(self, env, name, failure_config, maintenance_operator):
+        self.env = env
+        self.name = name
+        self.failure_config = failure_config
+        self.maintenance_operator = maintenance_operator
+        self.has_failure = False
+        self.failure_message = ""
+        self.failure_count = 0
+        self.downtime_total = 0.0
+        self._failure_started_at = None
+        self.repaired_event = None
+        self.failure_observer = None
+        self.state_listeners = []
+        self._operational_state = None
+
+    @property
+    def operational_state(self):
+        return self._operational_state
+
+    @operational_state.setter
+    def operational_state(self, state):
+        if state != self._operational_state:
+            self._operational_state = state
+            for listener in self.state_listeners:
+                listener(self.name, state)
+
+    @property
+    def display_state(self):
+        return state_name(self._operational_state)
+
+    def current_states(self):
+        return [(self.name, self._operational_state)]
+
+    def current_downtime(self):
+        """Accumulated downtime including a repair that is still in progress"""
+        downtime = self.downtime_total
+        if self._failure_started_at is not None:
+            downtime += self.env.now - self._failure_started_at
+        return downtime
+
+    def _handle_failure(self, failure_msg):
+        self.has_failure = True
+        self.operational_state = self.failed_state
+        self.failure_message = failure_msg
+        self.failure_count += 1
+        self._failure_started_at = self.env.now
+        self.repaired_event = self.env.event()
+        if self.failure_observer is not None:
+            self.failure_observer(1)
+        
+        repair_success = yield self.maintenance_operator.request_repair(self.machine_type, self.name)
+        
+        if repair_success:
+            self.downtime_total += self.env.now - self._failure_started_at
+            self._failure_started_at = None
+            self.has_failure = False
+            self.failure_message = ""
+            self.repaired_event.succeed()
+            if self.failure_observer is not None:
+                self.failure_observer(-1)
+
+class ProductLoadingModule(StationModule):
+    __slots__ = ()
+    machine_type = 'product_loader'
+    failed_state = OperationalState.LOADING_FAILED
+    failure_check_segments = (1.0, 2.5)
+    nominal_cycle_time = sum(failure_check_segments)
+
+    def __init__(self, env, name, failure_config, maintenance_operator):
+        super().__init__(env, name, failure_config, maintenance_operator)
+        self.operational_state = OperationalState.MODULE_STANDBY
+
+    def execute_loading_sequence(self, command):
+        return self.env.process(self._process_loading_command(command))
+
+    def _process_loading_command(self, command):
+        if command == "LOAD_PRODUCT":
+            if self.failure_config.should_fail('product_loader'):
+                yield from self._handle_failure("PRODUCT LOADER JAMMED")
+                return
+            
+            self.operational_state = OperationalState.LOADING_IN_PROGRESS
+            
+            yield self.env.timeout(1.0)
+            if self.failure_config.should_fail('product_loader'):
+                yield from self._handle_failure("LOADER MOTOR OVERHEAT")
+                return
+            
+            yield self.env.timeout(2.5)
+            self.operational_state = OperationalState.PRODUCT_LOADED
+            
+        elif command == "RESET_MODULE":
+            if not self.has_failure:
+                self.operational_state = OperationalState.MODULE_STANDBY
+
+class FlapFoldingModule(StationModule):
+    __slots__ = ('current_operation', 'lower_flaps', 'upper_flaps', 'folding_phase')
+    machine_type = 'flap_folding'
+    failed_state = OperationalState.FOLDING_FAILED
+    failure_check_segments = (0.8, 0.8, 0.8, 0.8, 1.0 + 0.8, 0.8, 0.8, 0.8, 1.0)
+    nominal_cycle_time = sum(failure_check_segments)
+
+    def __init__(self, env, name, failure_config, maintenance_operator):
+        super().__init__(env, name, failure_config, maintenance_operator)
+        self.operational_state = OperationalState.FLAPS_EXTENDED
+        self.current_operation = FoldingOperation.AWAITING_CARTON
+        
+        # FlapState per flap, indexed in FLAP_ORDER
+        self.lower_flaps = array('B', [FlapState.EXTENDED] * len(FLAP_ORDER))
+        self.upper_flaps = array('B', [FlapState.EXTENDED] * len(FLAP_ORDER))
+        self.folding_phase = FoldingPhase.AWAITING_START
+
+    def execute_folding_sequence(self, command):
+        return self.env.process(self._process_folding_command(command))
+
+    def _check_for_failure(self):
+        return self.failure_config.should_fail('flap_folding')
+
+    def _process_folding_command(self, command):
+        if command == "FOLD_FLAPS":
+            if self._check_for_failure():
+                yield from self._handle_failure("FLAP FOLDING SYSTEM FAILED")
+                return
+            
+            self.operational_state = OperationalState.FOLDING_IN_PROGRESS
+            self.folding_phase = FoldingPhase.LOWER_PHASE
+            
+            # PHASE 1: FOLD LOWER FLAPS (Create Bottom)
+            self.current_operation = FoldingOperation.FOLDING_LOWER_FLAPS
+            
+            # Fold lower flaps in sequence
+            for index, flap in enumerate(FLAP_ORDER):
+                self.lower_flaps[index] = FlapState.FOLDING
+                yield self.env.timeout(0.8)
+                if self._check_for_failure():
+                    yield from self._handle_failure(f"LOWER_{flap.upper()}_FOLD_FAILED")
+                    return
+                self.lower_flaps[index] = FlapState.FOLDED
+            
+            # Bottom compression
+            self.current_operation = FoldingOperation.COMPRESSING_BOTTOM
+            yield self.env.timeout(1.0)
+            
+            # PHASE 2: FOLD UPPER FLAPS (Close Top)
+            self.folding_phase = FoldingPhase.UPPER_PHASE
+            self.current_operation = FoldingOperation.FOLDING_UPPER_FLAPS
+            
+            # Fold upper flaps in sequence
+            for index, flap in enumerate(FLAP_ORDER):
+                self.upper_flaps[index] = FlapState.FOLDING
+                yield self.env.timeout(0.8)
+                if self._check_for_failure():
+                    yield from self._handle_failure(f"UPPER_{flap.upper()}_FOLD_FAILED")
+                    return
+                self.upper_flaps[index] = FlapState.FOLDED
+            
+            # Final compression
+            self.current_operation = FoldingOperation.FINAL_COMPRESSION
+            yield self.env.timeout(1.0)
+            
+            self.operational_state = OperationalState.ALL_FLAPS_FOLDED
+            self.folding_phase = FoldingPhase.COMPLETE
+            self.current_operation = FoldingOperation.SEQUENCE_COMPLETED
+            
+        elif command == "RESET_MODULE":
+            if not self.has_failure:
+                self.operational_state = OperationalState.FLAPS_EXTENDED
+                self.current_operation = FoldingOperation.AWAITING_CARTON
+                self.folding_phase = FoldingPhase.AWAITING_START
+                # Reset all flaps to extended
+                for index in range(len(FLAP_ORDER)):
+                    self.lower_flaps[index] = FlapState.EXTENDED
+                    self.upper_flaps[index] = FlapState.EXTENDED
+
+class TapeSealingModule(StationModule):
+    __slots__ = ('material_handler', 'tape_capacity_meters', 'tape_remaining_meters', 'need_tape_refill',
+                 'refilled_event', 'tape_refill_threshold')
+    machine_type = 'tape_sealing'
+    failed_state = OperationalState.SEALING_FAILED
+    failure_check_segments = (2.0, 2.0)
+    nominal_cycle_time = sum(failure_check_segments)
+    refill_material = 'tape_refill'
+
+    def __init__(self, env, name, failure_config, maintenance_operator, material_handler):
+        super().__init__(env, name, failure_config, maintenance_operator)
+        self.material_handler = material_handler
+        self.operational_state = OperationalState.SEALER_READY
+        self.tape_capacity_meters = 50
+        self.tape_remaining_meters = self.tape_capacity_meters
+        self.need_tape_refill = False
+        self.refilled_event = None
+        self.tape_refill_threshold = 10
+
+    @property
+    def material_capacity(self):
+        return self.tape_capacity_meters
+
+    @property
+    def display_state(self):
+        if self._operational_state == OperationalState.CARTON_SEALED:
+            return f"CARTON_SEALED ({self.tape_remaining_meters}m)"
+        return state_name(self._operational_state)
+
+    def execute_sealing_cycle(self, command):
+        return self.env.process(self._process_sealing_command(command))
+
+    def _handle_tape_refill(self):
+        """Human material handler must manually refill tape"""
+        self.need_tape_refill = True
+        self.refilled_event = self.env.event()
+        self.operational_state = OperationalState.AWAITING_TAPE_REFILL
+        
+        # Request human material handler to refill
+        refill_success = yield self.material_handler.request_refill('tape_refill', self.name)
+        
+        if refill_success:
+            self.tape_remaining_meters = self.tape_capacity_meters
+            self.need_tape_refill = False
+            self.operational_state = OperationalState.SEALER_READY
+            self.refilled_event.succeed()
+
+    def _process_sealing_command(self, command):
+        if command == "SEAL_CARTON":
+            # Check if tape is available
+            if self.tape_remaining_meters <= 0:
+                yield from self._handle_tape_refill()
+                return
+                
+            # Use tape
+            if self.failure_config.should_fail('tape_sealing'):
+                yield from self._handle_failure("TAPE SEALING FAILED")
+                return
+            
+            self.operational_state = OperationalState.SEALING_IN_PROGRESS
+            
+            yield self.env.timeout(2.0)
+            if self.failure_config.should_fail('tape_sealing'):
+                yield from self._handle_failure("TAPE JAM DURING SEALING")
+                return
+            
+            yield self.env.timeout(2.0)
+            self.tape_remaining_meters -= 1
+            self.operational_state = OperationalState.CARTON_SEALED
+            
+        elif command == "RESET_MODULE":
+            if not self.has_failure and not self.need_tape_refill:
+                self.operational_state = OperationalState.SEALER_READY
+
+class LabelApplicationModule(StationModule):
+    __slots__ = ('material_handler', 'label_capacity', 'labels_remaining_count', 'need_label_refill',
+                 'refilled_event', 'label_refill_threshold')
+    machine_type = 'label_applicator'
+    failed_state = OperationalState.LABELING_FAILED
+    failure_check_segments = (1.25, 1.25)
+    nominal_cycle_time = sum(failure_check_segments)
+    refill_material = 'label_refill'
+
+    def __init__(self, env, name, failure_config, maintenance_operator, material_handler):
+        super().__init__(env, name, failure_config, maintenance_operator)
+        self.material_handler = material_handler
+        self.operational_state = OperationalState.LABELER_READY
+        self.label_capacity = 5
+        self.labels_remaining_count = self.label_capacity
+        self.need_label_refill = False
+        self.refilled_event = None
+        self.label_refill_threshold = 5
+
+    @property
+    def material_capacity(self):
+        return self.label_capacity
+
+    @property
+    def display_state(self):
+        if self._operational_state == OperationalState.LABEL_APPLIED:
+            return f"LABEL_APPLIED ({self.labels_remaining_count})"
+        return state_name(self._operational_state)
+
+    def execute_labeling_cycle(self, command):
+        return self.env.process(self._process_labeling_command(command))
+
+    def _handle_label_refill(self):
+        """Human material handler must manually refill labels"""
+        self.need_label_refill = True
+        self.refilled_event = self.env.event()
+        self.operational_state = OperationalState.AWAITING_LABEL_REFILL
+        
+        # Request human material handler to refill
+        refill_success = yield self.material_handler.request_refill('label_refill', self.name)
+        
+        if refill_success:
+            self.labels_remaining_count = self.label_capacity
+            self.need_label_refill = False
+            self.operational_state = OperationalState.LABELER_READY
+            self.refilled_event.succeed()
+
+    def _process_labeling_command(self, command):
+        if command == "APPLY_LABEL":
+            # Check if labels are available
+            if self.labels_remaining_count <= 0:
+                yield from self._handle_label_refill()
+                return
+            
+            # Use label
+            if self.failure_config.should_fail('label_applicator'):
+                yield from self._handle_failure("LABEL APPLICATOR FAILED")
+                return
+            
+            self.operational_state = OperationalState.LABELING_IN_PROGRESS
+            
+            yield self.env.timeout(1.25)
+            if self.failure_config.should_fail('label_applicator'):
+                yield from self._handle_failure("LABEL JAM DURING APPLICATION")
+                return
+            
+            yield self.env.timeout(1.25)
+            self.labels_remaining_count -= 1
+            self.operational_state = OperationalState.LABEL_APPLIED
+            
+        elif command == "RESET_MODULE":
+            if not self.has_failure and not self.need_label_refill:
+                self.operational_state = OperationalState.LABELER_READY
+
+class ConveyorDriveUnit(StationModule):
+    __slots__ = ()
+    machine_type = 'conveyor'
+    failed_state = OperationalState.CONVEYOR_FAILED
+    failure_check_segments = (1.5, 1.5)
+    nominal_cycle_time = sum(failure_check_segments)
+
+    def __init__(self, env, name, failure_config, maintenance_operator):
+        super().__init__(env, name, failure_config, maintenance_operator)
+        self.operational_state = OperationalState.CONVEYOR_STOPPED
+
+    def execute_conveyor_command(self, command):
+        return self.env.process(self._process_conveyor_command(command))
+
+    def _process_conveyor_command(self, command):
+        if command == "START_CONVEYOR":
+            if self.failure_config.should_fail('conveyor'):
+                yield from self._handle_failure("CONVEYOR DRIVE FAILED")
+                return
+            
+            self.operational_state = OperationalState.CONVEYOR_RUNNING
+            
+            yield self.env.timeout(1.5)
+            if self.failure_config.should_fail('conveyor'):
+                yield from self._handle_failure("CONVEYOR BELT SLIPPAGE")
+                return
+            
+            yield self.env.timeout(1.5)
+            self.operational_state = OperationalState.CONVEYOR_STOPPED
+            
+        elif command == "RESET_MODULE":
+            if not self.has_failure:
+                self.operational_state = OperationalState.CONVEYOR_STOPPED
+
+class Carton:
+    """A carton in a pipelined station; a stage whose module failed or ran out
+    of material during its visit marks it defective"""
+    __slots__ = ('number', 'defective')
+
+    def __init__(self, number):
+        self.number = number
+        self.defective = False
+
+class PipelineStage:
+    """One station module running as its own process between two bounded buffers.
+    
+    Tracks how long the module is busy, starved (waiting for a carton from
+    upstream) and blocked (holding a finished carton the downstream buffer
+    has no room for).
+    """
+    __slots__ = ('env', 'name', 'module_command', 'reset_command', 'defect_events', 'input_buffer',
+                 'output_buffer', 'on_complete', 'processed_cartons', 'busy_time', 'starved_time',
+                 'blocked_time')
+
+    def __init__(self, env, name, module_command, reset_command, defect_events, input_buffer, output_buffer,
+                 on_complete=None):
+        self.env = env
+        self.name = name
+        self.module_command = module_command
+        self.reset_command = reset_command
+        self.defect_events = defect_events      # callable: the module's failure and refill count so far
+        self.input_buffer = input_buffer
+        self.output_buffer = output_buffer
+        self.on_complete = on_complete
+        self.processed_cartons = 0
+        self.busy_time = 0.0
+        self.starved_time = 0.0
+        self.blocked_time = 0.0
+
+    def statistics(self):
+        return {
+            'processed_cartons': self.processed_cartons,
+            'busy_time': self.busy_time,
+            'starved_time': self.starved_time,
+            'blocked_time': self.blocked_time
+        }
+
+    def run(self):
+        while True:
+            waiting_since = self.env.now
+            carton = yield self.input_buffer.get()
+            self.starved_time += self.env.now - waiting_since
+            
+            working_since = self.env.now
+            defect_events = self.defect_events()
+            yield self.module_command()
+            if self.defect_events() != defect_events:
+                carton.defective = True
+            yield self.reset_command()
+            self.busy_time += self.env.now - working_since
+            self.processed_cartons += 1
+            
+            if self.output_buffer is None:
+                self.on_complete(carton)
+                continue
+            
+            blocked_since = self.env.now
+            yield self.output_buffer.put(carton)
+            self.blocked_time += self.env.now - blocked_since
+
+# =====================================================
+# ----------- Packaging Station Controller ------------
+# =====================================================
+
+class PackagingStationController:
+    """Runs cartons through loader -> folder -> sealer -> labeler -> conveyor.
+    
+    flow_mode="serial" processes one carton at a time through all modules.
+    flow_mode="pipelined" runs every module as its own process connected by
+    buffers holding up to `buffer_capacity` cartons, so several cartons are
+    in flight at once.
+    """
+    FLOW_MODES = ("serial", "pipelined")
+
+    def __init__(self, env, flow_mode="serial", buffer_capacity=1, station_name=None,
+                 maintenance_operator=None, material_handler=None, random_streams=None,
+                 failure_model="geometric"):
+        if flow_mode not in self.FLOW_MODES:
+            raise ValueError(f"Unknown flow mode {flow_mode!r}, expected one of {self.FLOW_MODES}")
+        self.env = env
+        self.station_name = station_name
+        self.random_streams = random_streams or RandomStreams()
+        self.flow_mode = flow_mode
+        self.buffer_capacity = buffer_capacity
+        self.pipeline_stages = []
+        self.infeed_blocked_time = 0.0
+        self.failed_module_count = 0
+        self.station_downtime = 0.0
+        self._station_down_since = None
+        self.state_listeners = []
+        self._station_status = OperationalState.STATION_IDLE
+        self.total_packages_processed = 0
+        self.completed_packages_count = 0
+        self.has_station_failure = False
+        self.station_failure_message = ""
+        
+        # Initialize human resources (a plant passes in its shared crew)
+        name = self._component_name
+        self.failure_config = FailureConfiguration(self.random_streams, name(""), failure_model, env)
+        self.maintenance_operator = maintenance_operator or MaintenanceOperator(
+            env, "Maintenance Operator", random_streams=self.random_streams)
+        self.material_handler = material_handler or MaterialHandler(
+            env, "Material Handler", random_streams=self.random_streams)
+        
+        # Initialize components with human resources
+        self.carton_presence_detector = CartonPresenceDetector(
+            env, name("CartonPresenceSensor"), self.random_streams.stream(name("CartonPresenceSensor.arrivals")))
+        self.product_loading_module = ProductLoadingModule(env, name("ProductLoader"), self.failure_config, self.maintenance_operator)
+        self.flap_folding_module = FlapFoldingModule(env, name("FlapFoldingUnit"), self.failure_config, self.maintenance_operator)
+        self.tape_sealing_module = TapeSealingModule(env, name("TapeSealingSystem"), self.failure_config, self.maintenance_operator, self.material_handler)
+        self.label_application_module = LabelApplicationModule(env, name("LabelApplicator"), self.failure_config, self.maintenance_operator, self.material_handler)
+        self.conveyor_drive_unit = ConveyorDriveUnit(env, name("ConveyorDrive"), self.failure_config, self.maintenance_operator)
+        
+        for module in self.station_modules():
+            module.failure_observer = self._on_module_failure_change
+        self.kpis = StationKPIs(self)
+        
+        # Start system processes
+        self.env.process(self.carton_presence_detector.generate_detection_data())
+        if flow_mode == "pipelined":
+            self._start_pipeline()
+        else:
+            self.env.process(self._packaging_sequence_controller())
+
+    def _component_name(self, component):
+        return f"{self.station_name}.{component}" if self.station_name else component
+
+    @property
+    def station_status(self):
+        return self._station_status
+
+    @station_status.setter
+    def station_status(self, status):
+        if status != self._station_status:
+            self._station_status = status
+            for listener in self.state_listeners:
+                listener(self.station_name or "PackagingStation", status)
+
+    def current_states(self):
+        return [(self.station_name or "PackagingStation", self._station_status)]
+
+    def state_sources(self):
+        """Everything that reports state transitions: station, modules and its human resources"""
+        return [self, *self.station_modules(), self.maintenance_operator, self.material_handler]
+
+    @property
+    def cartons_in_flight(self):
+        return self.total_packages_processed - self.completed_packages_count
+
+    @property
+    def queued_cartons(self):
+        if self.flow_mode == "pipelined":
+            return len(self.pipeline_stages[0].input_buffer.items)
+        return int(self.carton_presence_detector.carton_present and self.station_status == OperationalState.STATION_IDLE)
+
+    @property
+    def work_in_progress_count(self):
+        if self.flow_mode == "pipelined":
+            return self.cartons_in_flight
+        return int(self.station_status in WORK_IN_PROGRESS_STATES)
+
+    def station_modules(self):
+        return (self.product_loading_module, self.flap_folding_module, self.tape_sealing_module,
+                self.label_application_module, self.conveyor_drive_unit)
+
+    def model_parameters(self):
+        """Current value of every parameter apply_parameters() accepts"""
+        parameters = {f"failure_chance.{machine_type}": chance
+                      for machine_type, chance in self.failure_config.failure_chances.items()}
+        parameters.update({f"repair_time.{machine_type}": (low + high) / 2
+                           for machine_type, (low, high) in self.maintenance_operator.repair_times.items()})
+        parameters.update({f"refill_time.{material_type}": (low + high) / 2
+                           for material_type, (low, high) in self.material_handler.refill_times.items()})
+        parameters['tape_capacity'] = self.tape_sealing_module.tape_capacity_meters
+        parameters['label_capacity'] = self.label_application_module.label_capacity
+        return parameters
+
+    def apply_parameters(self, parameters):
+        """Override model parameters by name before the run starts.
+        
+          failure_chance.<machine_type>  per-check failure chance in percent
+          repair_time.<machine_type>     mean repair time; its (min, max) range scales along
+          refill_time.<material_type>    mean refill time of 'tape_refill' / 'label_refill'
+          tape_capacity, label_capacity  material stock after a refill
+        """
+        for name, value in parameters.items():
+            kind, _, key = name.partition(".")
+            if kind == "failure_chance" and key in self.failure_config.failure_chances:
+                self.failure_config.failure_chances[key] = value
+            elif kind == "repair_time" and key in self.maintenance_operator.repair_times:
+                self.maintenance_operator.repair_times[key] = _scaled_range(
+                    self.maintenance_operator.repair_times[key], value)
+            elif kind == "refill_time" and key in self.material_handler.refill_times:
+                self.material_handler.refill_times[key] = _scaled_range(
+                    self.material_handler.refill_times[key], value)
+            elif name == "tape_capacity":
+                self.tape_sealing_module.tape_capacity_meters = int(value)
+                self.tape_sealing_module.tape_remaining_meters = int(value)
+            elif name == "label_capacity":
+                self.label_application_module.label_capacity = int(value)
+                self.label_application_module.labels_remaining_count = int(value)
+            else:
+                raise ValueError(f"Unknown model parameter {name!r}, expected one of "
+                                 f"{sorted(self.model_parameters())}")
+        self.failure_config.reset_schedules()
+
+    def bottleneck_module(self):
+        """Module with the longest nominal cycle, which paces pipelined flow"""
+        return max(self.station_modules(), key=lambda module: module.nominal_cycle_time)
+
+    @property
+    def ideal_cycle_time(self):
+        """Seconds per carton with no failures, refills or starvation"""
+        cycle_times = [module.nominal_cycle_time for module in self.station_modules()]
+        return max(cycle_times) if self.flow_mode == "pipelined" else sum(cycle_times)
+
+    def snapshot(self):
+        """Capture the GUI-visible station state as one immutable StationSnapshot"""
+        flap_module = self.flap_folding_module
+        tape_module = self.tape_sealing_module
+        label_module = self.label_application_module
+        operator = self.maintenance_operator
+        material_handler = self.material_handler
+        return StationSnapshot(
+            sim_time=self.env.now,
+            station_status=self.station_status,
+            total_packages_processed=self.total_packages_processed,
+            completed_packages=self.completed_packages_count,
+            queued_cartons=self.queued_cartons,
+            detection_status=self.carton_presence_detector.detection_status,
+            loader_state=self.product_loading_module.operational_state,
+            folder_state=flap_module.operational_state,
+            sealer_state=tape_module.operational_state,
+            labeler_state=label_module.operational_state,
+            conveyor_state=self.conveyor_drive_unit.operational_state,
+            module_failures=tuple(module.has_failure for module in self.station_modules()),
+            operator_available=operator.available,
+            operator_task=operator.current_task,
+            repair_queue_length=len(operator.repair_queue),
+            handler_available=material_handler.available,
+            handler_task=material_handler.current_task,
+            refill_queue_length=len(material_handler.refill_queue),
+            folding_phase=flap_module.folding_phase,
+            lower_flaps=tuple(flap_module.lower_flaps),
+            upper_flaps=tuple(flap_module.upper_flaps),
+            tape_remaining_meters=tape_module.tape_remaining_meters,
+            labels_remaining_count=label_module.labels_remaining_count,
+            need_tape_refill=tape_module.need_tape_refill,
+            need_label_refill=label_module.need_label_refill,
+            oee_factors=self.kpis.oee_factors(),
+            downtime=self.kpis.downtime()
+        )
+
+    def _on_module_failure_change(self, delta):
+        """Accumulate the time during which at least one module is down"""
+        if delta > 0 and self.failed_module_count == 0:
+            self._station_down_since = self.env.now
+        self.failed_module_count += delta
+        if self.failed_module_count == 0:
+            self.station_downtime += self.env.now - self._station_down_since
+            self._station_down_since = None
+
+    def current_station_downtime(self):
+        downtime = self.station_downtime
+        if self._station_down_since is not None:
+            downtime += self.env.now - self._station_down_since
+        return downtime
+
+    def _check_for_station_failure(self):
+        failed_modules = []
+        if self.product_loading_module.has_failure:
+            failed_modules.append("Product Loader")
+        if self.flap_folding_module.has_failure:
+            failed_modules.append("Flap Folding")
+        if self.tape_sealing_module.has_failure:
+            failed_modules.append("Tape Sealing")
+        if self.label_application_module.has_failure:
+            failed_modules.append("Label Application")
+        if self.conveyor_drive_unit.has_failure:
+            failed_modules.append("Conveyor")
+            
+        if failed_modules:
+            self.has_station_failure = True
+            self.station_failure_message = f"STATION HALTED: {', '.join(failed_modules)} FAILED"
+            self.station_status = OperationalState.STATION_FAILED
+            return True
+        return False
+
+    def _pending_material_refills(self):
+        pending = []
+        if self.tape_sealing_module.need_tape_refill:
+            pending.append(self.tape_sealing_module.refilled_event)
+        if self.label_application_module.need_label_refill:
+            pending.append(self.label_application_module.refilled_event)
+        return pending
+
+    def _packaging_sequence_controller(self):
+        detector = self.carton_presence_detector
+        while True:
+            if not detector.carton_present:
+                yield detector.carton_arrived
+            
+            detector.take_carton()
+            self.total_packages_processed += 1
+            self.station_status = OperationalState.PROCESSING_ACTIVE
+            yield self.env.process(self._execute_packaging_workflow())
+
+    def _start_pipeline(self):
+        modules = [
+            (self.product_loading_module.execute_loading_sequence, "LOAD_PRODUCT"),
+            (self.flap_folding_module.execute_folding_sequence, "FOLD_FLAPS"),
+            (self.tape_sealing_module.execute_sealing_cycle, "SEAL_CARTON"),
+            (self.label_application_module.execute_labeling_cycle, "APPLY_LABEL"),
+            (self.conveyor_drive_unit.execute_conveyor_command, "START_CONVEYOR")
+        ]
+        buffers = [simpy.Store(self.env, capacity=self.buffer_capacity) for _ in modules]
+        
+        for index, (execute, command) in enumerate(modules):
+            module = self.station_modules()[index]
+            output_buffer = buffers[index + 1] if index + 1 < len(buffers) else None
+            stage = PipelineStage(self.env, module.name,
+                                  lambda execute=execute, command=command: execute(command),
+                                  lambda execute=execute: execute("RESET_MODULE"),
+                                  lambda name=module.name: self.kpis.module_defect_events[name],
+                                  buffers[index], output_buffer, self._complete_pipelined_carton)
+            self.pipeline_stages.append(stage)
+            self.env.process(stage.run())
+        
+        self.env.process(self._pipeline_infeed(buffers[0]))
+
+    def _pipeline_infeed(self, infeed_buffer):
+        detector = self.carton_presence_detector
+        while True:
+            if not detector.carton_present:
+                yield detector.carton_arrived
+            
+            detector.take_carton()
+            self.total_packages_processed += 1
+            self.station_status = OperationalState.PIPELINE_ACTIVE
+            
+            blocked_since = self.env.now
+            yield infeed_buffer.put(Carton(detector.carton_counter))
+            self.infeed_blocked_time += self.env.now - blocked_since
+
+    def _complete_pipelined_carton(self, carton):
+        self.completed_packages_count += 1
+        self.kpis.carton_completed(carton.defective)
+        if self.cartons_in_flight == 0:
+            self.station_status = OperationalState.STATION_IDLE
+
+    def pipeline_statistics(self):
+        return {stage.name: stage.statistics() for stage in self.pipeline_stages}
+
+    def _execute_packaging_workflow(self):
+        # The carton is defective if any module fails or runs out of material while it is in the station
+        defect_events = self.kpis.defect_events
+        
+        # Wait for outstanding material refills before starting
+        pending_refills = self._pending_material_refills()
+        if pending_refills:
+            self.station_status = OperationalState.AWAITING_MATERIALS
+            yield self.env.all_of(pending_refills)
+
+        # Step 1: Load product
+        self.station_status = OperationalState.LOADING_PRODUCT
+        yield self.product_loading_module.execute_loading_sequence("LOAD_PRODUCT")
+        if self._check_for_station_failure():
+            yield from self._handle_station_failure()
+            return
+
+        # Step 2: Fold flaps
+        self.station_status = OperationalState.FOLDING_FLAPS
+        yield self.flap_folding_module.execute_folding_sequence("FOLD_FLAPS")
+        if self._check_for_station_failure():
+            yield from self._handle_station_failure()
+            return
+
+        # Step 3: Seal carton
+        self.station_status = OperationalState.SEALING_CARTON
+        yield self.tape_sealing_module.execute_sealing_cycle("SEAL_CARTON")
+        if self._check_for_station_failure():
+            yield from self._handle_station_failure()
+            return
+
+        # Step 4: Apply label
+        self.station_status = OperationalState.APPLYING_LABEL
+        yield self.label_application_module.execute_labeling_cycle("APPLY_LABEL")
+        if self._check_for_station_failure():
+            yield from self._handle_station_failure()
+            return
+
+        # Step 5: Conveyor
+        self.station_status = OperationalState.CONVEYOR_OPERATING
+        yield self.conveyor_drive_unit.execute_conveyor_command("START_CONVEYOR")
+        if self._check_for_station_failure():
+            yield from self._handle_station_failure()
+            return
+
+        # Step 6: Reset
+        self.station_status = OperationalState.RESETTING_STATION
+        yield self.product_loading_module.execute_loading_sequence("RESET_MODULE")
+        yield self.flap_folding_module.execute_folding_sequence("RESET_MODULE")
+        yield self.tape_sealing_module.execute_sealing_cycle("RESET_MODULE")
+        yield self.label_application_module.execute_labeling_cycle("RESET_MODULE")
+        yield self.conveyor_drive_unit.execute_conveyor_command("RESET_MODULE")
+        
+        self.completed_packages_count += 1
+        self.kpis.carton_completed(self.kpis.defect_events != defect_events)
+        self.station_status = OperationalState.STATION_IDLE
+
+    def _handle_station_failure(self):
+        pending_repairs = [module.repaired_event for module in self.station_modules() if module.has_failure]
+        if pending_repairs:
+            yield self.env.all_of(pending_repairs)
+        
+        yield self.env.process(self._reset_station_after_repair())
+
+    def _reset_station_after_repair(self):
+        yield self.product_loading_module.execute_loading_sequence("RESET_MODULE")
+        yield self.flap_folding_module.execute_folding_sequence("RESET_MODULE")
+        yield self.tape_sealing_module.execute_sealing_cycle("RESET_MODULE")
+        yield self.label_application_module.execute_labeling_cycle("RESET_MODULE")
+        yield self.conveyor_drive_unit.execute_conveyor_command("RESET_MODULE")
+        
+        self.has_station_failure = False
+        self.station_failure_message = ""
+        self.station_status = OperationalState.STATION_IDLE
+
+def _scaled_range(time_range, mean):
+    """Stretch a (min, max) duration range so its midpoint becomes `mean`"""
+    low, high = time_range
+    factor = mean / ((low + high) / 2)
+    return (low * factor, high * factor)
+
+# =====================================================
+# ----------- Streaming KPIs --------------------------
+# =====================================================
+
+class StationKPIs:
+    """OEE, per-module MTBF/MTTR and refill waiting of one station, kept up to date incrementally.
+    
+    Module state listeners count defect events (a module failed or ran out of
+    material while holding a carton) and accumulate the time any module waits
+    for a refill. The controller reports each completed carton, marked
+    defective if a defect event hit it, so a carton hit twice counts once.
+    Downtime and failure counts come from the modules' own repair accounting.
+    Every update and every query is O(1) in the length of the run.
+    """
+    REFILL_STATES = frozenset((OperationalState.AWAITING_TAPE_REFILL, OperationalState.AWAITING_LABEL_REFILL))
+
+    def __init__(self, controller):
+        self.controller = controller
+        self.env = controller.env
+        self.defective_cartons = 0
+        self.defect_events = 0
+        self.module_defect_events = {}
+        self.refill_wait_time = 0.0
+        self._refill_wait_since = None
+        self._awaiting_refill = set()
+        self._failed_states = {}
+        for module in controller.station_modules():
+            self._failed_states[module.name] = module.failed_state
+            self.module_defect_events[module.name] = 0
+            module.state_listeners.append(self._on_module_state)
+
+    def _on_module_state(self, module_name, state):
+        if state in self.REFILL_STATES:
+            self._count_defect_event(module_name)
+            if not self._awaiting_refill:
+                self._refill_wait_since = self.env.now
+            self._awaiting_refill.add(module_name)
+        elif state == self._failed_states[module_name]:
+            self._count_defect_event(module_name)
+        
+        if module_name in self._awaiting_refill and state not in self.REFILL_STATES:
+            self._awaiting_refill.discard(module_name)
+            if not self._awaiting_refill:
+                self.refill_wait_time += self.env.now - self._refill_wait_since
+                self._refill_wait_since = None
+
+    def _count_defect_event(self, module_name):
+        self.defect_events += 1
+        self.module_defect_events[module_name] += 1
+
+    def carton_completed(self, defective):
+        if defective:
+            self.defective_cartons += 1
+
+    def current_refill_wait_time(self):
+        wait_time = self.refill_wait_time
+        if self._refill_wait_since is not None:
+            wait_time += self.env.now - self._refill_wait_since
+        return wait_time
+
+    def downtime(self):
+        """Time the station could not produce: any module down in serial flow, the
+        bottleneck module down in pipelined flow (the other stages keep working)"""
+        controller = self.controller
+        if controller.flow_mode == "pipelined":
+            return controller.bottleneck_module().current_downtime()
+        return controller.current_station_downtime()
+
+    def availability(self):
+        """Share of the time the station could produce; the one availability every report uses"""
+        now = self.env.now
+        return 1.0 - self.downtime() / now if now > 0 else 1.0
+
+    def performance(self):
+        """Ideal cycle time of the completed cartons over the time the station was up"""
+        operating_time = self.env.now - self.downtime()
+        if operating_time <= 0:
+            return 0.0
+        return self.controller.ideal_cycle_time * self.controller.completed_packages_count / operating_time
+
+    def quality(self):
+        """Share of completed cartons that went through every module without a failure or refill"""
+        completed = self.controller.completed_packages_count
+        if not completed:
+            return 1.0
+        return 1.0 - self.defective_cartons / completed
+
+    def oee_factors(self):
+        return (self.availability(), self.performance(), self.quality())
+
+    def oee(self):
+        availability, performance, quality = self.oee_factors()
+        return availability * performance * quality
+
+    def refill_wait_share(self):
+        return self.current_refill_wait_time() / self.env.now if self.env.now > 0 else 0.0
+
+    def module_reliability(self):
+        """Failures, MTBF and MTTR per machine type (NaN where a module never failed)"""
+        reliability = {}
+        for module in self.controller.station_modules():
+            downtime = module.current_downtime()
+            failures = module.failure_count
+            reliability[module.machine_type] = {
+                'failures': failures,
+                'mtbf': (self.env.now - downtime) / failures if failures else float('nan'),
+                'mttr': downtime / failures if failures else float('nan')
+            }
+        return reliability
+
+    def operator_utilization(self):
+        return {
+            'maintenance_operator': self.controller.maintenance_operator.utilization(),
+            'material_handler': self.controller.material_handler.utilization()
+        }
+
+    def to_dict(self):
+        availability, performance, quality = self.oee_factors()
+        return {
+            'oee': availability * performance * quality,
+            'availability': availability,
+            'performance': performance,
+            'quality': quality,
+            'defective_cartons': self.defective_cartons,
+            'defect_events': self.defect_events,
+            'refill_wait_share': self.refill_wait_share(),
+            'module_reliability': self.module_reliability(),
+            'operator_utilization': self.operator_utilization()
+        }
+
+# =====================================================
+# ----------- State Snapshots -------------------------
+# =====================================================
+
+StationSnapshot = namedtuple('StationSnapshot', [
+    'sim_time', 'station_status', 'total_packages_processed', 'completed_packages', 'queued_cartons',
+    'detection_status',
+    'loader_state', 'folder_state', 'sealer_state', 'labeler_state', 'conveyor_state',
+    'module_failures',      # has_failure per module, loader -> conveyor
+    'operator_available', 'operator_task', 'repair_queue_length',
+    'handler_available', 'handler_task', 'refill_queue_length',
+    'folding_phase', 'lower_flaps', 'upper_flaps',      # flaps ordered front, back, left, right
+    'tape_remaining_meters', 'labels_remaining_count', 'need_tape_refill', 'need_label_refill',
+    'oee_factors',          # (availability, performance, quality)
+    'downtime'              # StationKPIs.downtime, the complement of availability
+])
+
+class SnapshotPublisher:
+    """Lock-free single-slot hand-off of the latest StationSnapshot.
+    
+    The simulation thread replaces one reference per publish, which is atomic
+    under the GIL; readers take whatever snapshot is current and never block
+    the writer. Snapshots are immutable, so a reader always sees one
+    consistent station state.
+    """
+    def __init__(self):
+        self._latest = None
+        self.published_count = 0
+
+    def publish(self, snapshot):
+        self._latest = snapshot
+        self.published_count += 1
+
+    def latest(self):
+        return self._latest
+
+# =====================================================
+# ----------- KPI Trend History -----------------------
+# =====================================================
+
+# Snapshot fields kept as trends; cumulative ones keep their last value per
+# bucket and are turned into rates (throughput, availability) when read
+TREND_FIELDS = ('completed_packages', 'downtime', 'tape_remaining_meters', 'labels_remaining_count',
+                'queued_cartons', 'repair_queue_length', 'refill_queue_length')
+CUMULATIVE_TREND_FIELDS = ('completed_packages', 'downtime')
+# (name, bucket seconds, buckets kept): 10 min of seconds, 12 h of minutes, 30 days of hours
+TREND_TIERS = (('second', 1.0, 600), ('minute', 60.0, 720), ('hour', 3600.0, 720))
+# Throughput and availability are rates over at least this many seconds, since
+# a one-second bucket rarely completes a carton
+TREND_RATE_WINDOW = 300.0
+
+class TrendTier:
+    """Fixed-size ring of per-bucket aggregates at one time resolution.
+    
+    A sample holds until the next one, so gauge fields are averaged over a
+    bucket weighted by the sim time each sample covers, whether the samples
+    came every event or once per GUI frame. Cumulative fields keep the last
+    sample of the bucket. A closed bucket overwrites the oldest slot once
+    the ring is full; buckets no sample fell into are left out.
+    """
+    def __init__(self, resolution, capacity, fields=TREND_FIELDS, cumulative_fields=CUMULATIVE_TREND_FIELDS):
+        self.resolution = resolution
+        self.capacity = capacity
+        self.fields = fields
+        self._cumulative = [field in cumulative_fields for field in fields]
+        self.times = array('d', bytes(8 * capacity))
+        self.columns = [array('d', bytes(8 * capacity)) for _ in fields]
+        self.head = 0
+        self.count = 0
+        self._bucket = None
+        self._bucket_sums = [0.0] * len(fields)
+        self._bucket_weight = 0.0
+        self._held_since = None     # time and values of the latest sample
+        self._held_values = None
+
+    def _hold(self, duration):
+        """Credit the latest sample's values for `duration` sim seconds of the open bucket"""
+        if duration <= 0:
+            return
+        sums = self._bucket_sums
+        for index, value in enumerate(self._held_values):
+            sums[index] += value * duration
+        self._bucket_weight += duration
+
+    def add(self, time, values):
+        bucket = int(time // self.resolution)
+        if bucket != self._bucket:
+            if self._bucket is not None:
+                # The latest sample held until the end of its bucket
+                self._hold((self._bucket + 1) * self.resolution - self._held_since)
+                self._close_bucket()
+            self._bucket = bucket
+            self._bucket_sums = [0.0] * len(self.fields)
+            self._bucket_weight = 0.0
+            if self._held_values is not None:
+                # ... and on into this bucket up to the new sample
+                self._hold(time - max(self._held_since, bucket * self.resolution))
+        else:
+            self._hold(time - self._held_since)
+        self._held_since = time
+        self._held_values = list(values)
+
+    def _bucket_point(self):
+        weight = self._bucket_weight
+        return self._held_since, [held if cumulative or weight <= 0 else total / weight
+                                  for held, total, cumulative in zip(self._held_values, self._bucket_sums,
+                                                                     self._cumulative)]
+
+    def _close_bucket(self):
+        time, values = self._bucket_point()
+        self.times[self.head] = time
+        for column, value in zip(self.columns, values):
+            column[self.head] = value
+        self.head = (self.head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def points(self):
+        """(times, {field: values}) oldest first, including the still open bucket"""
+        start = (self.head - self.count) % self.capacity
+        order = [(start + offset) % self.capacity for offset in range(self.count)]
+        times = [self.times[slot] for slot in order]
+        columns = {field: [column[slot] for slot in order] for field, column in zip(self.fields, self.columns)}
+        if self._bucket is not None:
+            time, values = self._bucket_point()
+            times.append(time)
+            for field, value in zip(self.fields, values):
+                columns[field].append(value)
+        return times, columns
+
+class KPITrendHistory:
+    """Multi-resolution KPI trends of one station with constant memory.
+    
+    Every recorded snapshot feeds all tiers; each tier keeps a fixed number
+    of buckets, so a week-long run holds as much as a ten-minute one. The
+    GUI records the snapshots it takes from the SnapshotPublisher and reads
+    the series on its own thread, so the simulation thread never waits on it.
+    """
+    def __init__(self, tiers=TREND_TIERS):
+        self.tiers = {name: TrendTier(resolution, capacity) for name, resolution, capacity in tiers}
+        self.recorded_count = 0
+
+    def record(self, snapshot):
+        values = [getattr(snapshot, field) for field in TREND_FIELDS]
+        for tier in self.tiers.values():
+            tier.add(snapshot.sim_time, values)
+        self.recorded_count += 1
+
+    def series(self, tier_name):
+        """(times, {series: values}) of one tier: the gauge fields plus throughput per
+        hour and availability over the trailing rate window (from the second point on)"""
+        tier = self.tiers[tier_name]
+        times, columns = tier.points()
+        completed = columns.pop('completed_packages')
+        downtime = columns.pop('downtime')
+        window = max(tier.resolution, TREND_RATE_WINDOW)
+        throughput, availability = [], []
+        start = 0
+        for index in range(1, len(times)):
+            # Latest earlier point at least one window back (the first point early on)
+            while start + 1 < index and times[index] - times[start + 1] >= window:
+                start += 1
+            elapsed = times[index] - times[start]
+            if elapsed <= 0:
+                elapsed = float('inf')
+            throughput.append((completed[index] - completed[start]) * 3600.0 / elapsed)
+            availability.append(max(0.0, 1.0 - (downtime[index] - downtime[start]) / elapsed))
+        series = {'throughput_per_hour': throughput, 'availability': availability}
+        series.update((field, values[1:]) for field, values in columns.items())
+        return times[1:], series
+
+# =====================================================
+# ----------- Real-time Simulation Engine -------------
+# =====================================================
+
+class PacingStatistics:
+    """How well the real-time runner keeps up with the requested speed"""
+    def __init__(self, lag_tolerance=0.25):
+        self.lag_tolerance = lag_tolerance
+        self.paced_steps = 0
+        self.late_steps = 0
+        self.current_lag = 0.0
+        self.max_lag = 0.0
+        self.falling_behind = False
+        self.achieved_speed = 0.0
+
+    def record_lag(self, lag):
+        """Record how many wall-clock seconds an event time was processed late"""
+        self.paced_steps += 1
+        self.current_lag = lag
+        self.max_lag = max(self.max_lag, lag)
+        if lag <= self.lag_tolerance:
+            self.falling_behind = False
+            return
+        
+        self.late_steps += 1
+        if not self.falling_behind:
+            print(f"⚠️ Simulation cannot keep up with the requested speed (lagging {lag:.2f} s)")
+        self.falling_behind = True
+
+# Paced runs go from half to a thousand times real time; UNLIMITED_SPEED never sleeps
+SIMULATION_SPEED_RANGE = (0.5, 1000.0)
+UNLIMITED_SPEED = float('inf')
+# Wall-clock seconds of flat-out simulation between two published snapshots
+UNLIMITED_FRAME_SECONDS = 1 / 30
+
+class IndustrialPackagingSimulation:
+    def __init__(self, flow_mode="serial", buffer_capacity=1, seed=None, failure_model="geometric",
+                 parameters=None):
+        self.env = simpy.Environment()
+        self.random_streams = RandomStreams(seed)
+        self.packaging_controller = PackagingStationController(self.env, flow_mode, buffer_capacity,
+                                                               random_streams=self.random_streams,
+                                                               failure_model=failure_model)
+        if parameters:
+            self.packaging_controller.apply_parameters(parameters)
+        self.simulation_active = False
+        self.simulation_speed_factor = 2.0
+        self.pacing_statistics = PacingStatistics()
+        self._pacing_wakeup = threading.Event()
+        self.snapshots = SnapshotPublisher()
+        self.publish_snapshot()
+
+    def publish_snapshot(self):
+        self.snapshots.publish(self.packaging_controller.snapshot())
+
+    def set_simulation_speed(self, speed):
+        """Pace at `speed` times real time, or run as fast as possible with UNLIMITED_SPEED"""
+        low, high = SIMULATION_SPEED_RANGE
+        self.simulation_speed_factor = speed if speed == UNLIMITED_SPEED else max(low, min(high, speed))
+        self._pacing_wakeup.set()
+
+    def run_realtime_simulation(self, until=float('inf')):
+        """Pace the simulation against the wall clock, scaled by simulation_speed_factor.
+        
+        The runner sleeps until the next scheduled event is due and then
+        processes every event at that sim time, so nothing wakes up while the
+        model is idle. Speed changes and stop requests interrupt the sleep.
+        At UNLIMITED_SPEED it never sleeps and publishes one snapshot per
+        frame; the GUI samples the latest one at its own rate.
+        """
+        self.simulation_active = True
+        self.pacing_statistics = PacingStatistics(self.pacing_statistics.lag_tolerance)
+        env = self.env
+        run_start_sim, run_start_wall = env.now, time.perf_counter()
+        anchor_sim, anchor_wall, anchor_speed = env.now, run_start_wall, self.simulation_speed_factor
+        
+        while self.simulation_active:
+            if self.simulation_speed_factor == UNLIMITED_SPEED:
+                anchor_speed = UNLIMITED_SPEED
+                if self._run_unlimited_frame(until):
+                    break
+                self._record_achieved_speed(run_start_sim, run_start_wall)
+                continue
+            
+            target_time = min(env.peek(), until)
+            if anchor_speed != self.simulation_speed_factor:
+                anchor_sim, anchor_wall, anchor_speed = env.now, time.perf_counter(), self.simulation_speed_factor
+            
+            due_wall = anchor_wall + (target_time - anchor_sim) / anchor_speed
+            delay = due_wall - time.perf_counter()
+            # An unbounded wait is fine: stop_simulation and speed changes set the wakeup
+            if delay > 0 and self._pacing_wakeup.wait(None if delay == float('inf') else delay):
+                self._pacing_wakeup.clear()
+                continue
+            self.pacing_statistics.record_lag(max(0.0, time.perf_counter() - due_wall))
+            
+            if target_time >= until:
+                env.run(until=until)
+                self.publish_snapshot()
+                break
+            while env.peek() <= target_time:
+                env.step()
+            self.publish_snapshot()
+            self._record_achieved_speed(run_start_sim, run_start_wall)
+                
+        if not self.simulation_active:
+            print("🛑 Simulation terminated")
+        self.simulation_active = False
+
+    def _run_unlimited_frame(self, until, batch_size=256):
+        """Step flat out for one frame, then publish; True once `until` (or the end of the schedule) is reached"""
+        env = self.env
+        frame_end = time.perf_counter() + UNLIMITED_FRAME_SECONDS
+        finished = False
+        while not finished and time.perf_counter() < frame_end:
+            for _ in range(batch_size):
+                if env.peek() >= until:
+                    if until != float('inf'):
+                        env.run(until=until)
+                    finished = True
+                    break
+                env.step()
+            if not self.simulation_active or self.simulation_speed_factor != UNLIMITED_SPEED:
+                break
+        self.publish_snapshot()
+        return finished
+
+    def _record_achieved_speed(self, run_start_sim, run_start_wall):
+        wall_elapsed = time.perf_counter() - run_start_wall
+        if wall_elapsed > 0:
+            self.pacing_statistics.achieved_speed = (self.env.now - run_start_sim) / wall_elapsed
+
+    def run_headless_simulation(self, until=8 * 3600):
+        """Run the station as fast as possible up to `until` and return its KPIs"""
+        self.simulation_active = True
+        wall_clock_start = time.perf_counter()
+        
+        self.env.run(until=until)
+        
+        self.simulation_active = False
+        self.publish_snapshot()
+        return HeadlessRunResult.from_controller(self.packaging_controller,
+                                                 time.perf_counter() - wall_clock_start)
+
+    def stop_simulation(self):
+        self.simulation_active = False
+        self._pacing_wakeup.set()
+
+# =====================================================
+# ----------- Headless Batch Runner -------------------
+# =====================================================
+
+class HeadlessRunResult:
+    """KPI summary of a headless simulation run"""
+    def __init__(self, sim_time, wall_time, started_packages, completed_packages, station_downtime,
+                 module_downtime, module_failures, operator_utilization, human_resource_queues,
+                 flow_mode="serial", pipeline_stages=None, seed=None, kpis=None, downtime=None):
+        self.seed = seed
+        self.sim_time = sim_time
+        self.wall_time = wall_time
+        self.started_packages = started_packages
+        self.completed_packages = completed_packages
+        self.station_downtime = station_downtime
+        # Time the station could not produce (StationKPIs.downtime); equals station_downtime in serial flow
+        self.downtime = station_downtime if downtime is None else downtime
+        self.module_downtime = module_downtime
+        self.module_failures = module_failures
+        self.operator_utilization = operator_utilization
+        self.human_resource_queues = human_resource_queues
+        self.flow_mode = flow_mode
+        self.pipeline_stages = pipeline_stages or {}
+        self.kpis = kpis or {}
+        self.profiler = None
+
+    @classmethod
+    def from_controller(cls, controller, wall_time=0.0):
+        modules = controller.station_modules()
+        return cls(
+            sim_time=controller.env.now,
+            wall_time=wall_time,
+            started_packages=controller.total_packages_processed,
+            completed_packages=controller.completed_packages_count,
+            station_downtime=controller.current_station_downtime(),
+            module_downtime={m.machine_type: m.current_downtime() for m in modules},
+            module_failures={m.machine_type: m.failure_count for m in modules},
+            operator_utilization=controller.kpis.operator_utilization(),
+            human_resource_queues={
+                'maintenance_operator': controller.maintenance_operator.queue_statistics(),
+                'material_handler': controller.material_handler.queue_statistics()
+            },
+            flow_mode=controller.flow_mode,
+            pipeline_stages=controller.pipeline_statistics(),
+            seed=controller.random_streams.master_seed,
+            kpis=controller.kpis.to_dict(),
+            downtime=controller.kpis.downtime()
+        )
+
+    @property
+    def throughput_per_hour(self):
+        return self.completed_packages * 3600.0 / self.sim_time if self.sim_time > 0 else 0.0
+
+    @property
+    def availability(self):
+        """StationKPIs availability: no module down in serial flow, the bottleneck
+        module up in pipelined flow; the same figure as the OEE availability"""
+        return 1.0 - self.downtime / self.sim_time if self.sim_time > 0 else 1.0
+
+    @property
+    def mttr(self):
+        """Mean time to repair over all modules, NaN when nothing failed"""
+        failures = sum(self.module_failures.values())
+        return sum(self.module_downtime.values()) / failures if failures else float('nan')
+
+    def to_dict(self):
+        return {
+            'seed': self.seed,
+            'sim_time': self.sim_time,
+            'wall_time': self.wall_time,
+            'started_packages': self.started_packages,
+            'completed_packages': self.completed_packages,
+            'station_downtime': self.station_downtime,
+            'downtime': self.downtime,
+            'throughput_per_hour': self.throughput_per_hour,
+            'availability': self.availability,
+            'mttr': self.mttr,
+            'oee': self.kpis.get('oee', float('nan')),
+            'performance': self.kpis.get('performance', float('nan')),
+            'quality': self.kpis.get('quality', float('nan')),
+            'refill_wait_share': self.kpis.get('refill_wait_share', float('nan')),
+            'module_reliability': {k: dict(v) for k, v in self.kpis.get('module_reliability', {}).items()},
+            'module_downtime': dict(self.module_downtime),
+            'module_failures': dict(self.module_failures),
+            'operator_utilization': dict(self.operator_utilization),
+            'human_resource_queues': {k: dict(v) for k, v in self.human_resource_queues.items()},
+            'flow_mode': self.flow_mode,
+            'pipeline_stages': {k: dict(v) for k, v in self.pipeline_stages.items()}
+        }
+
+    def format_report(self):
+        lines = [
+            f"📊 Simulated {self.sim_time / 3600:.2f} h ({self.flow_mode} flow) "
+            f"in {self.wall_time:.2f} s wall time, seed {self.seed}",
+            f"📦 Completed packages: {self.completed_packages} "
+            f"(started {self.started_packages}, {self.throughput_per_hour:.1f}/h)",
+            f"✅ Availability: {self.availability * 100:.1f}%  MTTR: {self.mttr:.1f} s",
+            "🔧 Module downtime:"
+        ]
+        if self.kpis:
+            lines.insert(3, f"🏭 OEE: {self.kpis['oee'] * 100:.1f}% "
+                            f"(availability {self.kpis['availability'] * 100:.1f}%, "
+                            f"performance {self.kpis['performance'] * 100:.1f}%, "
+                            f"quality {self.kpis['quality'] * 100:.1f}%), "
+                            f"refill wait {self.kpis['refill_wait_share'] * 100:.1f}% of the time")
+        reliability = self.kpis.get('module_reliability', {})
+        for machine_type, downtime in self.module_downtime.items():
+            line = f"   {machine_type}: {downtime:.1f} s ({self.module_failures[machine_type]} failures)"
+            if reliability.get(machine_type, {}).get('failures'):
+                line += (f", MTBF {reliability[machine_type]['mtbf']:.0f} s, "
+                         f"MTTR {reliability[machine_type]['mttr']:.1f} s")
+            lines.append(line)
+        lines.append("👥 Operator utilization:")
+        for operator, utilization in self.operator_utilization.items():
+            queue = self.human_resource_queues[operator]
+            lines.append(f"   {operator}: {utilization * 100:.1f}% "
+                         f"(mean wait {queue['mean_wait_time']:.2f} s, "
+                         f"max queue {queue['max_queue_length']})")
+        if self.pipeline_stages:
+            lines.append("🔀 Pipeline stages (busy / starved / blocked):")
+            for stage, stats in self.pipeline_stages.items():
+                lines.append(f"   {stage}: {stats['busy_time']:.0f} s / "
+                             f"{stats['starved_time']:.0f} s / {stats['blocked_time']:.0f} s")
+        return "\n".join(lines)
+
+def run_headless_simulation(until=8 * 3600, flow_mode="serial", buffer_capacity=1, seed=None,
+                            failure_model="geometric", trace_directory=None, parameters=None, profile=False):
+    """Build a fresh station and simulate it without any GUI or wall-clock pacing.
+    
+    With `profile`, the result's `profiler` holds per-generator SimPy statistics.
+    """
+    simulation = IndustrialPackagingSimulation(flow_mode, buffer_capacity, seed, failure_model, parameters)
+    recorder = None
+    if trace_directory is not None:
+        recorder = TraceRecorder(simulation.env, trace_directory)
+        recorder.attach(simulation.packaging_controller.state_sources())
+    profiler = SimProfiler(simulation.env).install() if profile else None
+    
+    result = simulation.run_headless_simulation(until)
+    if recorder is not None:
+        recorder.close()
+    if profiler is not None:
+        profiler.uninstall()
+        result.profiler = profiler
+    return result
+
+# =====================================================
+# ----------- Multi-Station Plant Model ---------------
+# =====================================================
+
+class PackagingPlant:
+    """K packaging stations in one environment sharing a maintenance crew
+    of `operator_count` operators and `handler_count` material handlers"""
+    def __init__(self, env, station_count, operator_count=1, handler_count=1,
+                 flow_mode="serial", buffer_capacity=1, seed=None, failure_model="geometric"):
+        self.env = env
+        self.random_streams = RandomStreams(seed)
+        self.maintenance_crew = MaintenanceOperator(env, "Maintenance Crew", capacity=operator_count,
+                                                    random_streams=self.random_streams)
+        self.material_crew = MaterialHandler(env, "Material Handlers", capacity=handler_count,
+                                             random_streams=self.random_streams)
+        self.stations = [
+            PackagingStationController(env, flow_mode, buffer_capacity,
+                                       station_name=f"Station{index + 1:03d}",
+                                       maintenance_operator=self.maintenance_crew,
+                                       material_handler=self.material_crew,
+                                       random_streams=self.random_streams,
+                                       failure_model=failure_model)
+            for index in range(station_count)
+        ]
+
+    def state_sources(self):
+        return [self.maintenance_crew, self.material_crew,
+                *(source for station in self.stations for source in (station, *station.station_modules()))]
+
+    def run_headless_simulation(self, until=7 * 24 * 3600):
+        wall_clock_start = time.perf_counter()
+        self.env.run(until=until)
+        return PlantRunResult.from_plant(self, time.perf_counter() - wall_clock_start)
+
+class PlantRunResult:
+    """Per-station KPIs plus crew utilization and queueing of a plant run"""
+    def __init__(self, sim_time, wall_time, station_results, crew_utilization, crew_queues, seed=None):
+        self.seed = seed
+        self.sim_time = sim_time
+        self.wall_time = wall_time
+        self.station_results = station_results
+        self.crew_utilization = crew_utilization
+        self.crew_queues = crew_queues
+        self.profiler = None
+
+    @classmethod
+    def from_plant(cls, plant, wall_time=0.0):
+        return cls(
+            sim_time=plant.env.now,
+            wall_time=wall_time,
+            station_results={station.station_name: HeadlessRunResult.from_controller(station)
+                             for station in plant.stations},
+            crew_utilization={
+                'maintenance_crew': plant.maintenance_crew.utilization(),
+                'material_crew': plant.material_crew.utilization()
+            },
+            crew_queues={
+                'maintenance_crew': plant.maintenance_crew.queue_statistics(),
+                'material_crew': plant.material_crew.queue_statistics()
+            },
+            seed=plant.random_streams.master_seed
+        )
+
+    @property
+    def completed_packages(self):
+        return sum(result.completed_packages for result in self.station_results.values())
+
+    @property
+    def throughput_per_hour(self):
+        return self.completed_packages * 3600.0 / self.sim_time if self.sim_time > 0 else 0.0
+
+    @property
+    def mean_availability(self):
+        results = self.station_results.values()
+        return sum(result.availability for result in results) / len(results) if results else 1.0
+
+    @property
+    def mean_oee(self):
+        results = self.station_results.values()
+        return sum(result.kpis['oee'] for result in results) / len(results) if results else 0.0
+
+    def to_dict(self):
+        return {
+            'seed': self.seed,
+            'sim_time': self.sim_time,
+            'wall_time': self.wall_time,
+            'completed_packages': self.completed_packages,
+            'throughput_per_hour': self.throughput_per_hour,
+            'mean_availability': self.mean_availability,
+            'mean_oee': self.mean_oee,
+            'crew_utilization': dict(self.crew_utilization),
+            'crew_queues': {k: dict(v) for k, v in self.crew_queues.items()},
+            'stations': {name: result.to_dict() for name, result in self.station_results.items()}
+        }
+
+    def format_report(self):
+        lines = [
+            f"🏭 Simulated {len(self.station_results)} stations for {self.sim_time / 3600:.1f} h "
+            f"in {self.wall_time:.1f} s wall time, seed {self.seed}",
+            f"📦 Completed packages: {self.completed_packages} ({self.throughput_per_hour:.1f}/h)",
+            f"✅ Mean station availability: {self.mean_availability * 100:.1f}%, "
+            f"mean OEE: {self.mean_oee * 100:.1f}%",
+            "👥 Crew:"
+        ]
+        for crew, utilization in self.crew_utilization.items():
+            queue = self.crew_queues[crew]
+            lines.append(f"   {crew}: {utilization * 100:.1f}% utilized, "
+                         f"mean wait {queue['mean_wait_time']:.1f} s, "
+                         f"mean queue {queue['mean_queue_length']:.2f}, "
+                         f"max queue {queue['max_queue_length']}")
+        return "\n".join(lines)
+
+def run_plant_simulation(station_count, operator_count=1, handler_count=1, until=7 * 24 * 3600,
+                         flow_mode="serial", buffer_capacity=1, seed=None, failure_model="geometric",
+                         trace_directory=None, profile=False):
+    """Simulate a plant of `station_count` stations sharing one crew, without any GUI"""
+    plant = PackagingPlant(simpy.Environment(), station_count, operator_count, handler_count,
+                           flow_mode, buffer_capacity, seed, failure_model)
+    recorder = None
+    if trace_directory is not None:
+        recorder = TraceRecorder(plant.env, trace_directory)
+        recorder.attach(plant.state_sources())
+    profiler = SimProfiler(plant.env).install() if profile else None
+    
+    result = plant.run_headless_simulation(until)
+    if recorder is not None:
+        recorder.close()
+    if profiler is not None:
+        profiler.uninstall()
+        result.profiler = profiler
+    return result
+
+# =====================================================
+# ----------- Analytic Fast Estimate ------------------
+# =====================================================
+
+class StationEstimate:
+    """Closed-form throughput and availability of one station, with optional simulated reference"""
+    def __init__(self, flow_mode, cycle_time, availability, quality, ideal_cycle_time, module_times):
+        self.flow_mode = flow_mode
+        self.cycle_time = cycle_time
+        self.availability = availability
+        self.quality = quality
+        self.ideal_cycle_time = ideal_cycle_time
+        self.module_times = module_times
+        self.simulated = None
+
+    @property
+    def throughput_per_hour(self):
+        return 3600.0 / self.cycle_time
+
+    @property
+    def oee(self):
+        return self.ideal_cycle_time / self.cycle_time * self.quality
+
+    def errors(self):
+        """Relative error of every estimated KPI against the simulated result, if any"""
+        if self.simulated is None:
+            return {}
+        return {kpi: getattr(self, kpi) / self.simulated[kpi] - 1.0
+                for kpi in ('throughput_per_hour', 'availability') if self.simulated[kpi]}
+
+    def to_dict(self):
+        return {
+            'flow_mode': self.flow_mode,
+            'cycle_time': self.cycle_time,
+            'throughput_per_hour': self.throughput_per_hour,
+            'availability': self.availability,
+            'quality': self.quality,
+            'oee': self.oee,
+            'module_times': dict(self.module_times),
+            'errors': self.errors()
+        }
+
+    def format_report(self):
+        lines = [f"🧮 Estimate ({self.flow_mode} flow): {self.throughput_per_hour:.1f}/h "
+                 f"(cycle {self.cycle_time:.2f} s), availability {self.availability * 100:.1f}%, "
+                 f"OEE {self.oee * 100:.1f}%"]
+        if self.simulated is not None:
+            errors = self.errors()
+            lines.append(f"📊 Simulated: {self.simulated['throughput_per_hour']:.1f}/h, availability "
+                         f"{self.simulated['availability'] * 100:.1f}% -> error "
+                         f"{errors.get('throughput_per_hour', 0.0) * 100:+.1f}% / "
+                         f"{errors.get('availability', 0.0) * 100:+.1f}%")
+        return "\n".join(lines)
+
+def _module_visit(segments, failure_chance, repair_range):
+    """Mean and second moment of the time of one carton's pass through a module
+    whose every check fails with `failure_chance`, plus its expected failures and
+    success probability; a failure costs one repair and skips the remaining work"""
+    repair_mean = (repair_range[0] + repair_range[1]) / 2
+    repair_square = repair_mean ** 2 + (repair_range[1] - repair_range[0]) ** 2 / 12
+    time = square = failures = elapsed = 0.0
+    reached = 1.0
+    for segment in segments:
+        failed = reached * failure_chance
+        failures += failed
+        time += failed * (elapsed + repair_mean)
+        square += failed * (elapsed ** 2 + 2 * elapsed * repair_mean + repair_square)
+        reached -= failed
+        elapsed += segment
+    time += reached * elapsed
+    square += reached * elapsed ** 2
+    return time, square, failures, reached
+
+def _two_stage_throughput(feed_time, feed_scv, bottleneck_time, bottleneck_scv, slots):
+    """Throughput of a feeder and a bottleneck separated by `slots` places, from the
+    exponential two-machine line with blocking; the buffer is stretched by
+    2 / (c_a^2 + c_s^2) so low-variability lines lose less to blocking"""
+    slots = slots * 2.0 / max(feed_scv + bottleneck_scv, 1e-3)
+    ratio = bottleneck_time / feed_time
+    if abs(ratio - 1.0) < 1e-9:
+        return (slots + 1) / (slots + 2) / feed_time
+    return (1.0 - ratio ** (slots + 1)) / (1.0 - ratio ** (slots + 2)) / feed_time
+
+def estimate_station(flow_mode="serial", failure_model="geometric", parameters=None, buffer_capacity=1):
+    """Approximate a station's steady state from its module check sequences,
+    failure configuration, repair/refill times and infeed probabilities.
+    
+    A serial cycle is the wait for the next carton plus the expected time of
+    every module, each including its repairs and the cartons on which it
+    stops for a refill. Pipelined flow runs at the pace of the slower of the
+    infeed and the slowest module. Per-check failure models are exact per
+    visit; time-based ones are solved as a fixed point of failures per cycle.
+    Crew queueing, blocking and starvation are ignored.
+    """
+    controller = IndustrialPackagingSimulation(flow_mode, buffer_capacity, 0, failure_model,
+                                               parameters).packaging_controller
+    failure_config = controller.failure_config
+    detector = CartonPresenceDetector
+    scan = detector.scan_interval
+    p, q = detector.arrival_probability, detector.departure_probability
+    
+    def module_estimates(cycle_time):
+        """(mean visit, visit second moment, failures, repair downtime, refills) per carton and module"""
+        estimates = {}
+        for module in controller.station_modules():
+            repair_range = controller.maintenance_operator.repair_times.get(module.machine_type, (5, 10))
+            segments = module.failure_check_segments
+            if failure_model in ("bernoulli", "geometric"):
+                chance = failure_config.failure_chances.get(module.machine_type, 0) / 100.0
+            else:
+                if failure_model == "mtbf":
+                    mean_gap = failure_config.mtbf_seconds.get(module.machine_type, math.inf)
+                else:
+                    scale, shape = failure_config.weibull_parameters.get(module.machine_type, (math.inf, 1.0))
+                    mean_gap = scale * math.gamma(1.0 + 1.0 / shape)
+                # Spread the failures expected per cycle evenly over the module's checks
+                chance = 1.0 - (1.0 - min(1.0, cycle_time / mean_gap)) ** (1.0 / len(segments))
+            visit, square, failures, success = _module_visit(segments, chance, repair_range)
+            
+            # A module out of material spends one carton's visit waiting for the refill
+            refills = 0.0
+            if module.refill_material is not None:
+                low, high = controller.material_handler.refill_times.get(module.refill_material, (10, 15))
+                refills = 1.0 / (module.material_capacity / max(success, 1e-9) + 1.0)
+                refill_mean = (low + high) / 2
+                visit = (1.0 - refills) * visit + refills * refill_mean
+                square = (1.0 - refills) * square + refills * (refill_mean ** 2 + (high - low) ** 2 / 12)
+                failures *= 1.0 - refills
+            estimates[module.machine_type] = (visit, square, failures,
+                                              failures * (repair_range[0] + repair_range[1]) / 2, refills)
+        return estimates
+
+    if flow_mode == "pipelined":
+        # The infeed takes a carton as soon as one shows up: p per scan, from one scan after the last
+        feed_time = scan / p
+        feed_scv = 1.0 - p
+        cycle_time = feed_time
+        for _ in range(50):
+            estimates = module_estimates(cycle_time)
+            visits = [estimate[0] for estimate in estimates.values()]
+            bottleneck = visits.index(max(visits))
+            visit, square = list(estimates.values())[bottleneck][:2]
+            # Between infeed and bottleneck: every upstream buffer and module holds a carton
+            slots = (bottleneck + 1) * buffer_capacity + bottleneck
+            cycle_time = 1.0 / _two_stage_throughput(feed_time, feed_scv, visit,
+                                                     square / visit ** 2 - 1.0, slots)
+        # Only the bottleneck's repairs stop the line, as in StationKPIs.downtime
+        bottleneck_repairs = estimates[controller.bottleneck_module().machine_type][3]
+        availability = max(0.0, 1.0 - bottleneck_repairs / cycle_time)
+    else:
+        # Two-state infeed: present with probability p / (p + q) once the cycle has mixed
+        present_share = p / (p + q)
+        arrival_wait = (1.0 - present_share) * scan * (1.0 / p - 0.5)
+        cycle_time = arrival_wait + controller.ideal_cycle_time
+        for _ in range(50):
+            estimates = module_estimates(cycle_time)
+            cycle_time = arrival_wait + sum(estimate[0] for estimate in estimates.values())
+        availability = 1.0 - sum(estimate[3] for estimate in estimates.values()) / cycle_time
+    
+    # A visit fails at most once or waits for a refill, so a carton is good if no module hit it
+    quality = math.prod(1.0 - failures - refills for _, _, failures, _, refills in estimates.values())
+    return StationEstimate(flow_mode, cycle_time, availability, quality,
+                           controller.ideal_cycle_time,
+                           {machine_type: estimate[0] for machine_type, estimate in estimates.items()})
+
+def validate_estimate(flow_mode="serial", failure_model="geometric", parameters=None, until=8 * 3600,
+                      seeds=range(4), buffer_capacity=1):
+    """Estimate a configuration and attach the mean simulated KPIs over `seeds` as its reference"""
+    estimate = estimate_station(flow_mode, failure_model, parameters, buffer_capacity)
+    results = [IndustrialPackagingSimulation(flow_mode, buffer_capacity, seed, failure_model,
+                                             parameters).run_headless_simulation(until)
+               for seed in seeds]
+    estimate.simulated = {
+        'throughput_per_hour': sum(result.throughput_per_hour for result in results) / len(results),
+        'availability': sum(result.availability for result in results) / len(results)
+    }
+    return estimate
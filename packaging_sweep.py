@@ -0,0 +1,202 @@
+"""Parameter sweeps of the packaging station model.
+
+Runs the headless station at every point of a parameter grid or of a Latin
+hypercube sample across a process pool, and collects one tidy row per
+(point, replication): the swept parameters followed by the run's KPIs.
+Parameter names are those of PackagingStationController.apply_parameters,
+e.g. failure_chance.tape_sealing, repair_time.flap_folding,
+refill_time.label_refill, tape_capacity, label_capacity.
+
+    python packaging_sweep.py --grid failure_chance.tape_sealing=1,2,3 --grid label_capacity=5,10,20
+    python packaging_sweep.py --lhs repair_time.flap_folding=8:24 --lhs tape_capacity=20:100 --samples 64 --csv sweep.csv
+
+With --cache DIR, runs already simulated by an earlier sweep are read from
+the result cache and only new (point, seed) pairs are simulated.
+"""
+import argparse
+import csv
+import itertools
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from packaging_cache import ResultCache, run_config, run_key
+from packaging_sim_model import FailureConfiguration, IndustrialPackagingSimulation, PackagingStationController
+
+SWEEP_KPIS = ('completed_packages', 'throughput_per_hour', 'availability', 'performance', 'quality',
+              'oee', 'mttr', 'refill_wait_share')
+INTEGER_PARAMETERS = ('tape_capacity', 'label_capacity')
+
+# =====================================================
+# ----------- Sweep Designs ---------------------------
+# =====================================================
+
+def grid_points(axes):
+    """Full factorial design over {parameter: [values]}"""
+    names = list(axes)
+    return [dict(zip(names, values)) for values in itertools.product(*(axes[name] for name in names))]
+
+def latin_hypercube_points(bounds, samples, seed=None):
+    """`samples` points over {parameter: (low, high)}, one in every 1/samples stratum of each parameter"""
+    rng = random.Random(seed)
+    columns = {}
+    for name, (low, high) in bounds.items():
+        strata = list(range(samples))
+        rng.shuffle(strata)
+        values = [low + (high - low) * (stratum + rng.random()) / samples for stratum in strata]
+        columns[name] = [round(value) for value in values] if name in INTEGER_PARAMETERS else values
+    return [{name: columns[name][index] for name in bounds} for index in range(samples)]
+
+# =====================================================
+# ----------- Sweep Runner ----------------------------
+# =====================================================
+
+def run_sweep_point(point, seed, until, flow_mode="serial", failure_model="geometric"):
+    """Simulate one parameter point with one seed; runs inside a pool worker"""
+    simulation = IndustrialPackagingSimulation(flow_mode, seed=seed, failure_model=failure_model,
+                                               parameters=point)
+    return simulation.run_headless_simulation(until).to_dict()
+
+def sweep_row(point, seed, result):
+    row = dict(point)
+    row['seed'] = seed
+    row.update((kpi, result[kpi]) for kpi in SWEEP_KPIS)
+    return row
+
+class ProgressBar:
+    """Single-line text progress bar on stderr"""
+    def __init__(self, total, width=40, stream=sys.stderr):
+        self.total = total
+        self.width = width
+        self.stream = stream
+        self.done = 0
+        self.started_at = time.perf_counter()
+
+    def advance(self):
+        self.done += 1
+        filled = self.width * self.done // self.total if self.total else self.width
+        elapsed = time.perf_counter() - self.started_at
+        remaining = elapsed / self.done * (self.total - self.done)
+        self.stream.write(f"\r[{'#' * filled}{'.' * (self.width - filled)}] {self.done}/{self.total} "
+                          f"runs, {elapsed:.0f} s elapsed, ~{remaining:.0f} s left ")
+        if self.done == self.total:
+            self.stream.write("\n")
+        self.stream.flush()
+
+class SweepResult:
+    """Tidy table of a sweep: one row per (point, replication)"""
+    def __init__(self, parameters, rows, wall_time, cached_runs=0):
+        self.parameters = parameters
+        self.rows = rows
+        self.wall_time = wall_time
+        self.cached_runs = cached_runs
+
+    @property
+    def columns(self):
+        return [*self.parameters, 'seed', *SWEEP_KPIS]
+
+    def to_csv(self, path):
+        with open(path, "w", newline="") as csv_file:
+            writer = csv.DictWriter(csv_file, fieldnames=self.columns)
+            writer.writeheader()
+            writer.writerows(self.rows)
+
+    def format_table(self):
+        def cell(value):
+            return f"{value:.4g}" if isinstance(value, float) else str(value)
+
+        cells = [self.columns] + [[cell(row[column]) for column in self.columns] for row in self.rows]
+        widths = [max(len(line[index]) for line in cells) for index in range(len(self.columns))]
+        lines = ["  ".join(text.rjust(width) for text, width in zip(line, widths)) for line in cells]
+        lines.insert(1, "  ".join("-" * width for width in widths))
+        return "\n".join(lines)
+
+def run_sweep(points, until=8 * 3600, replications=1, base_seed=None, workers=None,
+              flow_mode="serial", failure_model="geometric", progress=True, cache=None):
+    """Simulate every point `replications` times across all cores.
+
+    Replication r of every point uses seed base_seed + r, so points are
+    compared under common random numbers. With a ResultCache, runs it
+    already holds are not simulated again and new runs are added to it.
+    """
+    if base_seed is None:
+        base_seed = random.SystemRandom().randrange(2 ** 32)
+    workers = workers or os.cpu_count() or 1
+    runs = [(point, base_seed + replication) for point in points for replication in range(replications)]
+
+    wall_clock_start = time.perf_counter()
+    rows = [None] * len(runs)
+    keys = {}
+    if cache is not None:
+        for index, (point, seed) in enumerate(runs):
+            keys[index] = run_key(run_config(flow_mode, 1, failure_model, point), seed, until)
+            result = cache.get(keys[index])
+            if result is not None:
+                rows[index] = sweep_row(point, seed, result)
+    pending = [index for index, row in enumerate(rows) if row is None]
+    progress_bar = ProgressBar(len(pending)) if progress and pending else None
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(run_sweep_point, *runs[index], until, flow_mode, failure_model): index
+                   for index in pending}
+        for future in as_completed(futures):
+            index = futures[future]
+            result = future.result()
+            rows[index] = sweep_row(*runs[index], result)
+            if cache is not None:
+                cache.put(keys[index], result)
+            if progress_bar:
+                progress_bar.advance()
+
+    parameters = list(points[0]) if points else []
+    return SweepResult(parameters, rows, time.perf_counter() - wall_clock_start, len(runs) - len(pending))
+
+def _parse_axis(text):
+    name, _, values = text.partition("=")
+    convert = int if name in INTEGER_PARAMETERS else float
+    return name, [convert(value) for value in values.split(",")]
+
+def _parse_bounds(text):
+    name, _, bounds = text.partition("=")
+    low, _, high = bounds.partition(":")
+    return name, (float(low), float(high))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parameter sweep of the packaging station")
+    parser.add_argument("--grid", action="append", default=[], metavar="NAME=V1,V2,...",
+                        help="grid axis; the sweep covers every combination of all axes")
+    parser.add_argument("--lhs", action="append", default=[], metavar="NAME=LOW:HIGH",
+                        help="Latin hypercube range (use instead of --grid)")
+    parser.add_argument("--samples", type=int, default=32, help="Latin hypercube sample size")
+    parser.add_argument("--replications", type=int, default=1, help="seeds per point")
+    parser.add_argument("--until", type=float, default=8 * 3600, help="horizon per run in seconds")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="base seed; replication r of every point uses seed + r")
+    parser.add_argument("--workers", type=int, default=None, help="pool size (default: all cores)")
+    parser.add_argument("--flow", choices=PackagingStationController.FLOW_MODES, default="serial")
+    parser.add_argument("--failure-model", choices=FailureConfiguration.FAILURE_MODELS, default="geometric")
+    parser.add_argument("--csv", default=None, help="write the table to a CSV file instead of stdout")
+    parser.add_argument("--cache", default=None, metavar="DIR", help="reuse and extend a result cache")
+    parser.add_argument("--cache-size", type=float, default=512, help="cache size bound in MB")
+    args = parser.parse_args()
+
+    if bool(args.grid) == bool(args.lhs):
+        parser.error("give either --grid or --lhs axes")
+    if args.grid:
+        points = grid_points(dict(_parse_axis(axis) for axis in args.grid))
+    else:
+        points = latin_hypercube_points(dict(_parse_bounds(bounds) for bounds in args.lhs),
+                                        args.samples, args.seed)
+
+    cache = ResultCache(args.cache, int(args.cache_size * 1024 ** 2)) if args.cache else None
+    result = run_sweep(points, args.until, args.replications, args.seed, args.workers,
+                       args.flow, args.failure_model, cache=cache)
+    if cache is not None:
+        print(f"🗄️ {result.cached_runs}/{len(result.rows)} runs read from the cache", file=sys.stderr)
+    if args.csv:
+        result.to_csv(args.csv)
+        print(f"📄 {len(result.rows)} rows written to {args.csv} in {result.wall_time:.1f} s")
+    else:
+        print(result.format_table())
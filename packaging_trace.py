@@ -0,0 +1,246 @@
+"""Compact event trace of packaging station state transitions.
+
+Every transition of a station, module, operator or handler becomes one row of
+three columns: a float64 timestamp and two uint16 codes for the entity and its
+new state.  Names are interned once, so a row costs 12 bytes before
+compression.  Rows are collected in typed arrays and spilled to disk in
+zlib-compressed chunks, keeping memory bounded however long the run is:
+
+    trace_dir/trace.json         entity and state tables, chunk index
+    trace_dir/chunk_00000.bin    times | entity codes | state codes
+
+    python packaging_sim_node.py --headless --stations 20 --until 604800 --trace week_trace
+"""
+import json
+import os
+import sys
+import zlib
+from array import array
+from bisect import bisect_right
+
+TRACE_FORMAT_VERSION = 1
+TRACE_INDEX_FILE = "trace.json"
+
+# =====================================================
+# ----------- Trace Recorder --------------------------
+# =====================================================
+
+class TraceRecorder:
+    """Append-only columnar recorder fed by the model's state listeners.
+
+    With `directory=None` the trace stays in memory; otherwise every
+    `chunk_rows` rows are compressed and written out as one chunk file.
+    """
+    def __init__(self, env, directory=None, chunk_rows=65536, compression_level=1):
+        self.env = env
+        self.directory = directory
+        self.chunk_rows = chunk_rows
+        self.compression_level = compression_level
+        self.times = array('d')
+        self.entities = array('H')
+        self.states = array('H')
+        self.entity_names = []
+        self.state_names = []
+        self._entity_codes = {}
+        self._state_codes = {}
+        self.chunks = []
+        self.row_count = 0
+        self.bytes_written = 0
+        self._attached = set()
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def _intern(self, name, codes, names):
+        code = codes.get(name)
+        if code is None:
+            code = codes[name] = len(names)
+            # State codes are stored by name, so traces stay readable without the model
+            names.append(getattr(name, 'name', name))
+        return code
+
+    def record(self, entity, state):
+        """Append one transition at the current simulation time"""
+        self.times.append(self.env.now)
+        self.entities.append(self._intern(entity, self._entity_codes, self.entity_names))
+        self.states.append(self._intern(state, self._state_codes, self.state_names))
+        self.row_count += 1
+        if self.directory is not None and len(self.times) >= self.chunk_rows:
+            self.flush()
+
+    def attach(self, sources):
+        """Subscribe to state sources and record their current state as the first rows"""
+        for source in sources:
+            if id(source) in self._attached:
+                continue
+            self._attached.add(id(source))
+            for entity, state in source.current_states():
+                self.record(entity, state)
+            source.state_listeners.append(self.record)
+
+    def flush(self):
+        """Spill the buffered rows as one compressed chunk and rewrite the index"""
+        if self.directory is None or not self.times:
+            return
+        file_name = f"chunk_{len(self.chunks):05d}.bin"
+        columns = [self.times, self.entities, self.states]
+        if sys.byteorder != "little":
+            columns = [array(column.typecode, column) for column in columns]
+            for column in columns:
+                column.byteswap()
+        payload = zlib.compress(b"".join(column.tobytes() for column in columns), self.compression_level)
+        with open(os.path.join(self.directory, file_name), "wb") as chunk_file:
+            chunk_file.write(payload)
+
+        self.chunks.append({'file': file_name, 'rows': len(self.times),
+                            'start': self.times[0], 'end': self.times[-1]})
+        self.bytes_written += len(payload)
+        self.times = array('d')
+        self.entities = array('H')
+        self.states = array('H')
+        self._write_index()
+
+    def _write_index(self):
+        index = {
+            'format': TRACE_FORMAT_VERSION,
+            'entities': self.entity_names,
+            'states': self.state_names,
+            'rows': self.row_count - len(self.times),
+            'sim_time': self.env.now,
+            'chunks': self.chunks
+        }
+        with open(os.path.join(self.directory, TRACE_INDEX_FILE), "w") as index_file:
+            json.dump(index, index_file)
+
+    def close(self):
+        self.flush()
+        if self.directory is not None:
+            self._write_index()
+
+    def trace(self):
+        """In-memory trace of everything recorded so far (unspilled rows only when writing to disk)"""
+        return Trace(array('d', self.times), array('H', self.entities), array('H', self.states),
+                     list(self.entity_names), list(self.state_names), self.env.now)
+
+# =====================================================
+# ----------- Trace Reader ----------------------------
+# =====================================================
+
+class Trace:
+    """Columns of a recorded trace plus the tables decoding its codes"""
+    def __init__(self, times, entities, states, entity_names, state_names, sim_time):
+        self.times = times
+        self.entities = entities
+        self.states = states
+        self.entity_names = entity_names
+        self.state_names = state_names
+        self.sim_time = sim_time
+
+    def __len__(self):
+        return len(self.times)
+
+    def rows(self):
+        """Decoded (time, entity, state) rows in recording order"""
+        entity_names, state_names = self.entity_names, self.state_names
+        for time, entity, state in zip(self.times, self.entities, self.states):
+            yield time, entity_names[entity], state_names[state]
+
+    def entity_history(self, entity):
+        """(times, states) of one entity's transitions"""
+        code = self.entity_names.index(entity)
+        times = array('d')
+        states = []
+        for time, entity_code, state in zip(self.times, self.entities, self.states):
+            if entity_code == code:
+                times.append(time)
+                states.append(self.state_names[state])
+        return times, states
+
+    def state_at(self, entity, time):
+        """State of `entity` at simulation time `time` (None before its first row)"""
+        times, states = self.entity_history(entity)
+        position = bisect_right(times, time)
+        return states[position - 1] if position else None
+
+def load_trace(directory):
+    """Read a spilled trace back into memory"""
+    with open(os.path.join(directory, TRACE_INDEX_FILE)) as index_file:
+        index = json.load(index_file)
+    if index['format'] != TRACE_FORMAT_VERSION:
+        raise ValueError(f"Unsupported trace format {index['format']!r} in {directory}")
+
+    times, entities, states = array('d'), array('H'), array('H')
+    for chunk in index['chunks']:
+        with open(os.path.join(directory, chunk['file']), "rb") as chunk_file:
+            payload = zlib.decompress(chunk_file.read())
+        rows = chunk['rows']
+        times_end = rows * times.itemsize
+        times.frombytes(payload[:times_end])
+        entities.frombytes(payload[times_end:times_end + rows * entities.itemsize])
+        states.frombytes(payload[times_end + rows * entities.itemsize:])
+    if sys.byteorder != "little":
+        for column in (times, entities, states):
+            column.byteswap()
+    return Trace(times, entities, states, index['entities'], index['states'], index['sim_time'])
+
+# =====================================================
+# ----------- Trace Replay ----------------------------
+# =====================================================
+
+class TraceReplay:
+    """Random access to the entity states of a recorded trace.
+    
+    Every `keyframe_rows` rows a keyframe stores the state code of every
+    entity. Seeking restores the keyframe before the target time and applies
+    the remaining rows as deltas; playing forward only applies the rows in
+    between, so neither depends on how long the trace is.
+    """
+    UNKNOWN_STATE = 0xFFFF
+
+    def __init__(self, trace, keyframe_rows=4096):
+        self.trace = trace
+        self.keyframe_rows = keyframe_rows
+        self._entity_codes = {name: code for code, name in enumerate(trace.entity_names)}
+        self.keyframes = []
+        current = array('H', [self.UNKNOWN_STATE]) * len(trace.entity_names)
+        for start in range(0, len(trace) + 1, keyframe_rows):
+            self.keyframes.append(array('H', current))
+            for row in range(start, min(start + keyframe_rows, len(trace))):
+                current[trace.entities[row]] = trace.states[row]
+        self.current = array('H', self.keyframes[0])
+        self.row = 0
+        self.time = 0.0
+
+    @property
+    def duration(self):
+        return self.trace.sim_time
+
+    def seek(self, time):
+        """Move to simulation time `time` and return the number of rows applied"""
+        trace = self.trace
+        row = bisect_right(trace.times, time)
+        if not self.row <= row < self.row + self.keyframe_rows:
+            keyframe = row // self.keyframe_rows
+            self.current = array('H', self.keyframes[keyframe])
+            self.row = keyframe * self.keyframe_rows
+        
+        applied = row - self.row
+        current, entities, states = self.current, trace.entities, trace.states
+        for delta_row in range(self.row, row):
+            current[entities[delta_row]] = states[delta_row]
+        self.row = row
+        self.time = time
+        return applied
+
+    def state(self, entity):
+        """State of `entity` at the current replay time (None if unknown)"""
+        code = self._entity_codes.get(entity)
+        if code is None or self.current[code] == self.UNKNOWN_STATE:
+            return None
+        return self.trace.state_names[self.current[code]]
+
+    def station_entities(self):
+        """Trace entity of every station's controller, in recording order"""
+        if "PackagingStation" in self._entity_codes:
+            return ["PackagingStation"]
+        return [name[:-len(".ProductLoader")] for name in self.trace.entity_names
+                if name.endswith(".ProductLoader")]
@@ -0,0 +1,26 @@
+import simpy
+
+from packaging_sim_model import HumanResource
+
+
+def _run_job(env, operator, label, job_type, start, service_time, finished):
+    yield env.timeout(start)
+    yield env.process(operator._serve(job_type, label, label, service_time))
+    finished[label] = env.now
+
+
+def test_twice_preempted_job_stays_behind_more_urgent_work():
+    env = simpy.Environment()
+    operator = HumanResource(env, "Operator", priorities={'urgent': 0, 'routine': 1, 'low': 2},
+                             preemptive=True)
+    finished = {}
+    env.process(_run_job(env, operator, 'low', 'low', 0, 10, finished))
+    env.process(_run_job(env, operator, 'first urgent', 'urgent', 1, 1, finished))
+    env.process(_run_job(env, operator, 'second urgent', 'urgent', 3, 1, finished))
+    env.process(_run_job(env, operator, 'routine', 'routine', 3.5, 5, finished))
+    env.run()
+
+    assert operator.preempted_jobs == 2
+    # The twice-preempted low job resumes behind the routine job queued after it
+    assert finished['routine'] == 9
+    assert finished['low'] == 17
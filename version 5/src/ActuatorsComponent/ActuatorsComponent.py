@@ -45,6 +45,10 @@ ActuatorsComponent0 = 0
 
 # Start of user custom code region. Please apply edits only within these regions:  Global Variables & Definitions
 import simpy
+try:
+	from packaging_profiling import profile_from_environment
+except ImportError:  # opt-in, needs the repository root on PYTHONPATH
+	profile_from_environment = None
 
 # simple kinematic model for visualization / debugging
 AXIS_X_SPEED = 0.3   # “units per second”
@@ -130,6 +134,8 @@ class ActuatorsComponent:
 		# Start of user custom code region. Please apply edits only within these regions:  Constructor
 		# local SimPy env for actuator motion
 		self.env = simpy.Environment()
+		# per-generator SimPy profile when PACKAGING_SIM_PROFILE is set
+		self.profiler = profile_from_environment(self.env, "ActuatorsComponent") if profile_from_environment else None
 		self._last_env_target = 0.0
 
 		# internal physical state (for logs / 3D)
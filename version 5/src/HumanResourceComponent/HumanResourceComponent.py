@@ -38,6 +38,10 @@ HumanResourceComponent0 = 0
 
 # Start of user custom code region. Please apply edits only within these regions:  Global Variables & Definitions
 import simpy
+try:
+    from packaging_profiling import profile_from_environment
+except ImportError:  # opt-in, needs the repository root on PYTHONPATH
+    profile_from_environment = None
 
 # simple “service times” for HR
 # you can tune these if you want
@@ -74,6 +78,8 @@ class HumanResourceComponent:
         # Start of user custom code region. Please apply edits only within these regions:  Constructor
         # local SimPy env to simulate HR walking / working time
         self.env = simpy.Environment()
+        # per-generator SimPy profile when PACKAGING_SIM_PROFILE is set
+        self.profiler = profile_from_environment(self.env, "HumanResourceComponent") if profile_from_environment else None
         self._last_env_target = 0.0
 
         # current HR state
@@ -91,6 +91,10 @@ HumanResourceComponent2 = 2
 # Start of user custom code region. Please apply edits only within these regions:  Global Variables & Definitions
 from enum import Enum
 import simpy
+try:
+    from packaging_profiling import profile_from_environment
+except ImportError:  # opt-in, needs the repository root on PYTHONPATH
+    profile_from_environment = None
 
 
 class StationState(Enum):
@@ -185,6 +189,8 @@ class PLCComponent:
 
         # SimPy environment for KPIs
         self.env = simpy.Environment()
+        # per-generator SimPy profile when PACKAGING_SIM_PROFILE is set
+        self.profiler = profile_from_environment(self.env, "PLCComponent") if profile_from_environment else None
         self._last_env_target = 0.0
 
         # KPI counters
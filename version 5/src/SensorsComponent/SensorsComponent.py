@@ -57,6 +57,10 @@ PLCComponent0 = 0
 
 # Start of user custom code region. Please apply edits only within these regions:  Global Variables & Definitions
 import simpy
+try:
+    from packaging_profiling import profile_from_environment
+except ImportError:  # opt-in, needs the repository root on PYTHONPATH
+    profile_from_environment = None
 import random
 
 # thresholds and constants
@@ -117,6 +121,8 @@ class SensorsComponent:
 
         # Local SimPy environment for sensor behaviour
         self.env = simpy.Environment()
+        # per-generator SimPy profile when PACKAGING_SIM_PROFILE is set
+        self.profiler = profile_from_environment(self.env, "SensorsComponent") if profile_from_environment else None
 
         # internal stock and conveyor counters
         # (updated initial stock values)